@@ -20,8 +20,6 @@ sys.path.insert(0, os.path.dirname(__file__))
 from src.crypto_library_zkp import CryptographyLibraryZKP
 from src.colors import Colors
 import time
-import io
-import contextlib
 
 C = Colors
 
@@ -496,9 +494,7 @@ def main():
     # Ініціалізація криптосистеми
     clear()
     print(f"\n  {C.CYAN}Ініціалізація криптографічної системи...{C.RESET}")
-    f = io.StringIO()
-    with contextlib.redirect_stdout(f):
-        system = CryptographyLibraryZKP()
+    system = CryptographyLibraryZKP()
     print(f"  {C.GREEN}✓{C.RESET} Система ініціалізована\n")
     time.sleep(0.5)
 
@@ -22,6 +22,9 @@
     python benchmark_demo.py --csv results.csv    # Експорт у CSV
     python benchmark_demo.py --latex table.tex    # Експорт у LaTeX
     python benchmark_demo.py --no-verbose         # Без детального виводу ітерацій
+    python benchmark_demo.py --no-worker          # snarkjs CLI на кожну ітерацію
+    python benchmark_demo.py --save-distributions # зберігати всі виміри (box plot)
+    python benchmark_demo.py --parallel           # протоколи паралельно
 """
 
 import sys
@@ -64,7 +67,7 @@ def print_methodology():
 
     {C.CYAN}•{C.RESET} Однакові вхідні дані для всіх протоколів
     {C.CYAN}•{C.RESET} Множинні ітерації для статистичної достовірності
-    {C.CYAN}•{C.RESET} Вимірювання часу: time.perf_counter() (мс)
+    {C.CYAN}•{C.RESET} Вимірювання часу: time.perf_counter_ns() (нс → мс)
     {C.CYAN}•{C.RESET} Верифікація коректності кожного доказу
 
   {C.BOLD_WHITE}Метрики:{C.RESET}
@@ -139,6 +142,14 @@ def main():
         help='Генерація графіків у директорію (за замовчуванням: charts/)'
     )
 
+    parser.add_argument(
+        '--chart-formats',
+        type=str,
+        default='pdf,png',
+        metavar='FMT[,FMT]',
+        help='Формати графіків через кому: pdf, svg, png (за замовчуванням: pdf,png)'
+    )
+
     parser.add_argument(
         '--age',
         type=int,
@@ -166,6 +177,24 @@ def main():
         help='Вимкнути детальний вивід (показувати тільки прогрес-бар)'
     )
 
+    parser.add_argument(
+        '--no-worker',
+        action='store_true',
+        help='Запускати node/snarkjs окремим процесом на кожну ітерацію (без постійного воркера)'
+    )
+
+    parser.add_argument(
+        '--save-distributions',
+        action='store_true',
+        help='Зберігати всі виміри ітерацій (потрібно для box plot; вмикається з --charts)'
+    )
+
+    parser.add_argument(
+        '--parallel',
+        action='store_true',
+        help='Запускати Schnorr, Groth16 і PLONK паралельно в окремих процесах'
+    )
+
     args = parser.parse_args()
 
     # Визначення кількості ітерацій
@@ -187,7 +216,10 @@ def main():
         iterations=iterations,
         age=args.age,
         required_age=args.required_age,
-        verbose=verbose
+        verbose=verbose,
+        persistent_worker=not args.no_worker,
+        save_distributions=args.save_distributions or bool(args.charts),
+        parallel=args.parallel
     )
 
     try:
@@ -213,7 +245,7 @@ def main():
 
     if args.charts:
         print(f"\n{C.BOLD_WHITE}Генерація графіків...{C.RESET}")
-        benchmark.export_charts(args.charts)
+        benchmark.export_charts(args.charts, formats=tuple(args.chart_formats.split(',')))
 
     # Підсумок
     print()
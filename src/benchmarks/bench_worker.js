@@ -0,0 +1,95 @@
+/*
+ * Persistent snarkjs worker for ProtocolBenchmark.
+ *
+ * Usage: node bench_worker.js <groth16|plonk> <circuit.wasm> <circuit.zkey> <verification_key.json>
+ *
+ * snarkjs, the circuit WASM, the proving key and the verification key are
+ * loaded once at startup. After that the worker reads one JSON request per
+ * line from stdin:
+ *
+ *   {"age": 25, "requiredAge": 18}
+ *
+ * and answers with one JSON line on stdout:
+ *
+ *   {"ok": true, "proveNs": 12345678, "verifyNs": 4567890, "proofSize": 804}
+ *
+ * A request of the form {"batch": [{"age": 25, "requiredAge": 18}, ...]}
+ * runs every entry in the same session and is answered with one JSON array
+ * line holding a reply per entry, so a whole benchmark costs a single
+ * round trip.
+ *
+ * Timings are measured inside Node with process.hrtime.bigint(), so IPC
+ * with Python is not charged to the prove/verify numbers.
+ */
+
+const fs = require("fs");
+const readline = require("readline");
+const snarkjs = require("snarkjs");
+
+async function main() {
+    const [system, wasmPath, zkeyPath, vkeyPath] = process.argv.slice(2);
+    const prover = snarkjs[system];
+    if (!prover) {
+        throw new Error(`Unknown proving system: ${system}`);
+    }
+
+    const wasm = { type: "mem", data: fs.readFileSync(wasmPath) };
+    const zkey = { type: "mem", data: fs.readFileSync(zkeyPath) };
+    const vkey = JSON.parse(fs.readFileSync(vkeyPath, "utf8"));
+
+    async function run(request) {
+        try {
+            const input = {
+                age: String(request.age),
+                requiredAge: String(request.requiredAge),
+            };
+
+            const t0 = process.hrtime.bigint();
+            const { proof, publicSignals } = await prover.fullProve(input, wasm, zkey);
+            const t1 = process.hrtime.bigint();
+            const ok = await prover.verify(vkey, publicSignals, proof);
+            const t2 = process.hrtime.bigint();
+
+            return {
+                ok: ok === true,
+                proveNs: Number(t1 - t0),
+                verifyNs: Number(t2 - t1),
+                // Same formatting as `snarkjs ... prove` uses for proof.json
+                proofSize: Buffer.byteLength(JSON.stringify(proof, null, 1)),
+            };
+        } catch (err) {
+            return { ok: false, error: String(err && err.message ? err.message : err) };
+        }
+    }
+
+    const rl = readline.createInterface({ input: process.stdin, terminal: false });
+
+    for await (const line of rl) {
+        if (!line.trim()) {
+            continue;
+        }
+        let reply;
+        try {
+            const request = JSON.parse(line);
+            if (Array.isArray(request.batch)) {
+                reply = [];
+                for (const entry of request.batch) {
+                    reply.push(await run(entry));
+                }
+            } else {
+                reply = await run(request);
+            }
+        } catch (err) {
+            reply = { ok: false, error: String(err && err.message ? err.message : err) };
+        }
+        process.stdout.write(JSON.stringify(reply) + "\n");
+    }
+
+    // snarkjs keeps curve worker threads alive; exit explicitly on EOF
+    process.exit(0);
+}
+
+main().catch((err) => {
+    process.stderr.write(String(err && err.stack ? err.stack : err) + "\n");
+    process.exit(1);
+});
@@ -15,63 +15,240 @@ Metrics collected:
 Used for thesis Section 3.4.1: "ZK Protocol Efficiency Research"
 """
 
+import contextlib
+import functools
+import io
 import json
+import math
 import os
-import statistics
+import shutil
 import subprocess
 import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Callable
 
+import numpy as np
+
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.crypto_library_zkp import CryptographyLibraryZKP
-from src.colors import Colors
+from src.protocols.snarkjs_worker import read_reply
+from src.colors import (
+    Colors, COLORS_ENABLED, RESET, RED, GREEN, YELLOW, MAGENTA, CYAN, DIM,
+    BOLD_GREEN, BOLD_YELLOW, BOLD_MAGENTA, BOLD_CYAN, BOLD_WHITE
+)
 
 C = Colors
 
+# Bar/box fill colours for the exported charts: green, blue, purple
+CHART_COLORS = ('#2ecc71', '#3498db', '#9b59b6')
+
+# Proving systems benchmarked through snarkjs, with their display names
+SNARK_LABELS = {'groth16': 'Groth16', 'plonk': 'PLONK'}
+
+# Timings are measured and accumulated in integer nanoseconds
+NS_TO_MS = 1e-6
+
+# Seconds allowed per prove+verify round, as for each snarkjs CLI call
+ROUND_TIMEOUT = 30
+
+# print_results lines; built once so each row is a single str.format call.
+# Without a TTY the escapes are left out rather than written to the pipe.
+_RESULTS_TITLE = 'РЕЗУЛЬТАТИ ПОРІВНЯННЯ ZK-ПРОТОКОЛІВ'.center(80)
+_RESULTS_COLUMNS = (f"{'Протокол':<12} {'Setup (мс)':<14} {'Prove (мс)':<14} "
+                    f"{'Verify (мс)':<14} {'Proof (Б)':<12} {'Валід':<8}")
+_RESULTS_NA = f"{{proto:<12}} {'N/A':<14} {'N/A':<14} {'N/A':<14} {'N/A':<12} {'N/A':<8}"
+if COLORS_ENABLED:
+    RESULTS_BANNER = (f"{C.BOLD_CYAN}{'═' * 80}{C.RESET}\n"
+                      f"{C.BOLD_WHITE}{_RESULTS_TITLE}{C.RESET}\n"
+                      f"{C.BOLD_CYAN}{'═' * 80}{C.RESET}")
+    RESULTS_HEADER = f"{C.BOLD_WHITE}{_RESULTS_COLUMNS}{C.RESET}"
+    RESULTS_SEP = f"{C.DIM}{'─' * 80}{C.RESET}"
+    ROW_TMPL = (f"{C.BOLD_CYAN}{{proto:<12}}{C.RESET} {C.YELLOW}{{setup:<14}}{C.RESET} "
+                f"{C.YELLOW}{{prove:<14}}{C.RESET} {C.YELLOW}{{verify:<14}}{C.RESET} "
+                f"{C.BOLD_MAGENTA}{{size:<12}}{C.RESET} {{valid}}")
+    ROW_NA_TMPL = f"{C.DIM}{_RESULTS_NA}{C.RESET}"
+    ROW_OK = f"{C.BOLD_GREEN}OK{C.RESET}"
+    ROW_FAIL = f"{C.BOLD_RED}FAIL{C.RESET}"
+    RESULTS_FOOTER_TMPL = f"Ітерацій: {C.BOLD_WHITE}{{iterations}}{C.RESET}"
+else:
+    RESULTS_BANNER = f"{'═' * 80}\n{_RESULTS_TITLE}\n{'═' * 80}"
+    RESULTS_HEADER = _RESULTS_COLUMNS
+    RESULTS_SEP = '─' * 80
+    ROW_TMPL = "{proto:<12} {setup:<14} {prove:<14} {verify:<14} {size:<12} {valid}"
+    ROW_NA_TMPL = _RESULTS_NA
+    ROW_OK = "OK"
+    ROW_FAIL = "FAIL"
+    RESULTS_FOOTER_TMPL = "Ітерацій: {iterations}"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_plt():
+    """Import pyplot on first use, with the non-interactive Agg backend."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+class _Running:
+    """Streaming mean/std/min/max of one metric (Welford's online algorithm)."""
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def push(self, x: float):
+        self.count += 1
+        if self.count == 1:
+            self.min = self.max = x
+        elif x < self.min:
+            self.min = x
+        elif x > self.max:
+            self.max = x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (n - 1 denominator)."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
 
 @dataclass
 class BenchmarkResult:
-    """Results from a single benchmark run."""
+    """Results from a single benchmark run.
+
+    Statistics are accumulated on the fly; the raw per-iteration samples are
+    only retained when ``keep_samples`` is set (the box plots need them), in
+    a (4, n) float64 buffer preallocated by ``alloc``.
+
+    Times are recorded in nanoseconds (``perf_counter_ns``) and converted to
+    milliseconds only by the properties used for printing and export.
+    """
     protocol_name: str
-    setup_times: List[float] = field(default_factory=list)
-    prove_times: List[float] = field(default_factory=list)
-    verify_times: List[float] = field(default_factory=list)
-    proof_sizes: List[int] = field(default_factory=list)
     iterations: int = 0
     all_valid: bool = True
+    # Iterations whose prove/verify failed; they are not part of the stats
+    failures: int = 0
+    keep_samples: bool = False
+    setup_stats: _Running = field(default_factory=_Running, repr=False)
+    prove_stats: _Running = field(default_factory=_Running, repr=False)
+    verify_stats: _Running = field(default_factory=_Running, repr=False)
+    size_stats: _Running = field(default_factory=_Running, repr=False)
+    # Rows: setup, prove, verify, proof size; columns: iterations
+    _samples: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def alloc(cls, protocol_name: str, iterations: int, keep_samples: bool = False) -> 'BenchmarkResult':
+        """Create a result with the sample buffer sized for ``iterations``."""
+        result = cls(protocol_name=protocol_name, keep_samples=keep_samples)
+        if keep_samples:
+            result._samples = np.empty((4, iterations), dtype=np.float64)
+        return result
+
+    def record(self, setup_ns: int, prove_ns: int, verify_ns: int, proof_size: int):
+        """Add one iteration's measurements (times in nanoseconds)."""
+        i = self.prove_stats.count
+        self.setup_stats.push(setup_ns)
+        self.prove_stats.push(prove_ns)
+        self.verify_stats.push(verify_ns)
+        self.size_stats.push(proof_size)
+        if self.keep_samples:
+            if self._samples is None or i >= self._samples.shape[1]:
+                grown = np.empty((4, max(16, 2 * i)), dtype=np.float64)
+                if self._samples is not None:
+                    grown[:, :i] = self._samples[:, :i]
+                self._samples = grown
+            samples = self._samples
+            samples[0, i] = setup_ns
+            samples[1, i] = prove_ns
+            samples[2, i] = verify_ns
+            samples[3, i] = proof_size
+
+    def _sample_row(self, row: int) -> np.ndarray:
+        if self._samples is None:
+            return np.empty(0, dtype=np.float64)
+        return self._samples[row, :self.prove_stats.count]
+
+    @property
+    def setup_times(self) -> np.ndarray:
+        return self._sample_row(0) * NS_TO_MS
+
+    @property
+    def prove_times(self) -> np.ndarray:
+        return self._sample_row(1) * NS_TO_MS
+
+    @property
+    def verify_times(self) -> np.ndarray:
+        return self._sample_row(2) * NS_TO_MS
+
+    @property
+    def proof_sizes(self) -> np.ndarray:
+        return self._sample_row(3)
 
     @property
     def setup_mean(self) -> float:
-        return statistics.mean(self.setup_times) if self.setup_times else 0
+        return self.setup_stats.mean * NS_TO_MS
 
     @property
     def setup_std(self) -> float:
-        return statistics.stdev(self.setup_times) if len(self.setup_times) > 1 else 0
+        return self.setup_stats.std * NS_TO_MS
+
+    @property
+    def setup_min(self) -> float:
+        return self.setup_stats.min * NS_TO_MS
+
+    @property
+    def setup_max(self) -> float:
+        return self.setup_stats.max * NS_TO_MS
 
     @property
     def prove_mean(self) -> float:
-        return statistics.mean(self.prove_times) if self.prove_times else 0
+        return self.prove_stats.mean * NS_TO_MS
 
     @property
     def prove_std(self) -> float:
-        return statistics.stdev(self.prove_times) if len(self.prove_times) > 1 else 0
+        return self.prove_stats.std * NS_TO_MS
+
+    @property
+    def prove_min(self) -> float:
+        return self.prove_stats.min * NS_TO_MS
+
+    @property
+    def prove_max(self) -> float:
+        return self.prove_stats.max * NS_TO_MS
 
     @property
     def verify_mean(self) -> float:
-        return statistics.mean(self.verify_times) if self.verify_times else 0
+        return self.verify_stats.mean * NS_TO_MS
 
     @property
     def verify_std(self) -> float:
-        return statistics.stdev(self.verify_times) if len(self.verify_times) > 1 else 0
+        return self.verify_stats.std * NS_TO_MS
+
+    @property
+    def verify_min(self) -> float:
+        return self.verify_stats.min * NS_TO_MS
+
+    @property
+    def verify_max(self) -> float:
+        return self.verify_stats.max * NS_TO_MS
 
     @property
     def proof_size_mean(self) -> float:
-        return statistics.mean(self.proof_sizes) if self.proof_sizes else 0
+        return self.size_stats.mean
 
 
 class ProtocolBenchmark:
@@ -85,7 +262,9 @@ class ProtocolBenchmark:
         benchmark.export_to_csv('results.csv')
     """
 
-    def __init__(self, iterations: int = 100, age: int = 25, required_age: int = 18, verbose: bool = True):
+    def __init__(self, iterations: int = 100, age: int = 25, required_age: int = 18, verbose: bool = True,
+                 persistent_worker: bool = True, save_distributions: bool = False,
+                 parallel: bool = False):
         """
         Initialize benchmark suite.
 
@@ -94,95 +273,120 @@ class ProtocolBenchmark:
             age: Test age value (private input)
             required_age: Required age threshold (public input)
             verbose: Print details for each iteration
+            persistent_worker: Run Groth16/PLONK through one long-lived Node
+                process instead of spawning node/snarkjs per iteration
+            save_distributions: Keep every per-iteration sample (needed for
+                the box plots in export_charts); otherwise only running
+                statistics are stored
+            parallel: Run the Schnorr, Groth16 and PLONK benchmarks in
+                separate processes (pinned to disjoint CPU sets on Linux)
         """
         self.iterations = iterations
         self.age = age
         self.required_age = required_age
         self.verbose = verbose
+        self.persistent_worker = persistent_worker
+        self.save_distributions = save_distributions
+        self.parallel = parallel
         self.results: Dict[str, BenchmarkResult] = {}
 
         # Paths
         self.base_path = Path(__file__).parent.parent.parent
         self.circuits_path = self.base_path / "circuits" / "compiled"
+        self.worker_script = Path(__file__).parent / "bench_worker.js"
+
+        # One library instance shared by every Schnorr iteration
+        self.zkp = CryptographyLibraryZKP(metrics_enabled=False, verbose=True)
+
+        # Persistent snarkjs workers, keyed by proving system
+        self._workers: Dict[str, subprocess.Popen] = {}
+        self._scratch_dir: Optional[str] = None
 
-    def _run_command(self, cmd: list, timeout: int = 30) -> tuple:
-        """Run shell command and return (success, stdout, time_ms)."""
-        start = time.perf_counter()
+    def _run_command(self, cmd: list, timeout: int = 30, capture: bool = True) -> tuple:
+        """
+        Run shell command and return (success, stdout, time_ns).
+
+        stdout is returned as raw bytes (b"" when capture is False); stderr
+        is always discarded.
+        """
+        start = time.perf_counter_ns()
         try:
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 timeout=timeout
             )
-            elapsed = (time.perf_counter() - start) * 1000
-            return result.returncode == 0, result.stdout, elapsed
+            elapsed = time.perf_counter_ns() - start
+            return result.returncode == 0, result.stdout or b"", elapsed
         except subprocess.TimeoutExpired:
-            return False, "Timeout", 0
+            return False, b"Timeout", 0
 
     def _print_progress(self, current: int, total: int, protocol: str, width: int = 30):
         """Print a progress bar (used when verbose=False)."""
         percent = current / total
         filled = int(width * percent)
         bar = "█" * filled + "░" * (width - filled)
-        print(f"\r  {C.CYAN}{protocol:<10}{C.RESET} [{C.GREEN}{bar}{C.RESET}] {current}/{total} ({percent*100:.0f}%)", end="", flush=True)
+        print(f"\r  {CYAN}{protocol:<10}{RESET} [{GREEN}{bar}{RESET}] {current}/{total} ({percent*100:.0f}%)", end="", flush=True)
         if current == total:
             print()  # New line when done
 
     def _print_iteration(self, iteration: int, total: int, protocol: str,
-                         setup_time: float, prove_time: float, verify_time: float,
+                         setup_ns: int, prove_ns: int, verify_ns: int,
                          proof_size: int, is_valid: bool):
         """Print details for a single iteration."""
-        valid_str = f"{C.GREEN}OK{C.RESET}" if is_valid else f"{C.RED}FAIL{C.RESET}"
-        print(f"  {C.DIM}[{iteration:>3}/{total}]{C.RESET} "
-              f"{C.CYAN}{protocol:<8}{C.RESET} │ "
-              f"setup: {C.YELLOW}{setup_time:>7.2f}{C.RESET} мс │ "
-              f"prove: {C.YELLOW}{prove_time:>7.2f}{C.RESET} мс │ "
-              f"verify: {C.YELLOW}{verify_time:>7.2f}{C.RESET} мс │ "
-              f"proof: {C.MAGENTA}{proof_size:>5}{C.RESET} Б │ "
+        valid_str = f"{GREEN}OK{RESET}" if is_valid else f"{RED}FAIL{RESET}"
+        print(f"  {DIM}[{iteration:>3}/{total}]{RESET} "
+              f"{CYAN}{protocol:<8}{RESET} │ "
+              f"setup: {YELLOW}{setup_ns * NS_TO_MS:>7.2f}{RESET} мс │ "
+              f"prove: {YELLOW}{prove_ns * NS_TO_MS:>7.2f}{RESET} мс │ "
+              f"verify: {YELLOW}{verify_ns * NS_TO_MS:>7.2f}{RESET} мс │ "
+              f"proof: {MAGENTA}{proof_size:>5}{RESET} Б │ "
               f"{valid_str}")
 
     def benchmark_schnorr(self) -> BenchmarkResult:
         """Бенчмарк Schnorr Sigma Protocol."""
         print(f"\n{C.BOLD_WHITE}▶ Schnorr Sigma Protocol{C.RESET}")
 
-        result = BenchmarkResult(protocol_name="Schnorr")
-        zkp = CryptographyLibraryZKP()
+        result = BenchmarkResult.alloc("Schnorr", self.iterations, self.save_distributions)
+        zkp = self.zkp
+
+        # Warm-up outside the timed region: build the G/H tables so the first
+        # iteration doesn't bias the means
+        zkp.precompute_tables()
+        commitment, _ = zkp.create_age_commitment(self.age)
+        proof, _ = zkp.schnorr_prove(self.age, self.required_age, commitment)
+        zkp.schnorr_verify(commitment, self.required_age, proof)
 
         for i in range(self.iterations):
             # Setup (creating commitment) - included in setup time
-            setup_start = time.perf_counter()
+            setup_start = time.perf_counter_ns()
             commitment, _ = zkp.create_age_commitment(self.age)
-            setup_time = (time.perf_counter() - setup_start) * 1000
-            result.setup_times.append(setup_time)
+            setup_ns = time.perf_counter_ns() - setup_start
 
             # Prove
-            prove_start = time.perf_counter()
+            prove_start = time.perf_counter_ns()
             proof, prove_metrics = zkp.schnorr_prove(self.age, self.required_age, commitment)
-            prove_time = (time.perf_counter() - prove_start) * 1000
-            result.prove_times.append(prove_time)
-
-            # Calculate proof size
-            proof_json = json.dumps({
-                'R': str(proof['R']),
-                'c': proof['c'],
-                's': proof['s']
-            })
-            proof_size = len(proof_json.encode('utf-8'))
-            result.proof_sizes.append(proof_size)
-
-            # Verify
-            verify_start = time.perf_counter()
+            prove_ns = time.perf_counter_ns() - prove_start
+
+            # Proof size: length of json.dumps({'R': str(R), 'c': c, 's': s}),
+            # built directly (the text is pure ASCII, so chars == bytes)
+            proof_size = len(f'{{"R": "{proof["R"]}", "c": {proof["c"]}, "s": {proof["s"]}}}')
+
+            # Verify, cold: the commitment repeats across iterations, so drop
+            # the memoized statement instead of timing a cache hit
+            zkp.clear_statement_cache()
+            verify_start = time.perf_counter_ns()
             is_valid, verify_metrics = zkp.schnorr_verify(commitment, self.required_age, proof)
-            verify_time = (time.perf_counter() - verify_start) * 1000
-            result.verify_times.append(verify_time)
+            verify_ns = time.perf_counter_ns() - verify_start
 
+            result.record(setup_ns, prove_ns, verify_ns, proof_size)
             if not is_valid:
                 result.all_valid = False
 
             if self.verbose:
                 self._print_iteration(i + 1, self.iterations, "Schnorr",
-                                      setup_time, prove_time, verify_time, proof_size, is_valid)
+                                      setup_ns, prove_ns, verify_ns, proof_size, is_valid)
             else:
                 self._print_progress(i + 1, self.iterations, "Schnorr")
 
@@ -190,180 +394,230 @@ class ProtocolBenchmark:
         print(f"  {C.GREEN}✓{C.RESET} Завершено: {C.BOLD_YELLOW}{result.prove_mean:.2f} мс{C.RESET} prove, {C.BOLD_YELLOW}{result.verify_mean:.2f} мс{C.RESET} verify")
         return result
 
-    def benchmark_groth16(self) -> BenchmarkResult:
-        """Бенчмарк Groth16 zk-SNARK."""
-        print(f"\n{C.BOLD_WHITE}▶ Groth16 zk-SNARK{C.RESET}")
+    def _start_worker(self, system: str, wasm_path: Path, zkey_path: Path,
+                      vkey_path: Path) -> Optional[subprocess.Popen]:
+        """Start (or reuse) the persistent snarkjs worker for a proving system."""
+        worker = self._workers.get(system)
+        if worker is not None and worker.poll() is None:
+            return worker
 
-        result = BenchmarkResult(protocol_name="Groth16")
+        try:
+            worker = subprocess.Popen(
+                ["node", str(self.worker_script), system,
+                 str(wasm_path), str(zkey_path), str(vkey_path)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+                cwd=str(self.base_path)
+            )
+        except FileNotFoundError:
+            return None
 
-        # Check if setup files exist
-        zkey_path = self.circuits_path / "age_check_groth16.zkey"
-        vkey_path = self.circuits_path / "verification_key_groth16.json"
-        wasm_path = self.circuits_path / "age_check_js" / "age_check.wasm"
-        witness_gen = self.circuits_path / "age_check_js" / "generate_witness.js"
+        self._workers[system] = worker
+        return worker
 
-        if not all(p.exists() for p in [zkey_path, vkey_path, wasm_path]):
-            print(f"  {C.YELLOW}⚠{C.RESET} Groth16 setup files not found. Run: npm run compile")
-            return result
+    def _worker_request(self, worker: subprocess.Popen, request: Dict, timeout: float):
+        """Send one request line to the worker and read back its JSON reply."""
+        try:
+            worker.stdin.write(json.dumps(request) + "\n")
+            worker.stdin.flush()
+            line = read_reply(worker, timeout)
+        except (BrokenPipeError, OSError):
+            line = ""
+        if not line:
+            # Dead or hung: stop it so the caller falls back to the CLI
+            worker.kill()
+            worker.wait()
+            return None
+        return json.loads(line)
+
+    def close(self):
+        """Stop persistent snarkjs workers and remove CLI scratch files."""
+        for worker in self._workers.values():
+            if worker.poll() is None:
+                worker.stdin.close()
+                try:
+                    worker.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    worker.kill()
+        self._workers.clear()
+
+        if self._scratch_dir is not None:
+            shutil.rmtree(self._scratch_dir, ignore_errors=True)
+            self._scratch_dir = None
+
+    def _snark_batch_worker(self, worker: subprocess.Popen, count: int) -> List[tuple]:
+        """
+        Run ``count`` prove+verify rounds in one request to the worker.
 
-        for i in range(self.iterations):
-            setup_time = 0  # Setup already done
-            result.setup_times.append(setup_time)
+        Returns (prove_ns, verify_ns, proof_size, ok) per round, stopping at
+        the first round the worker could not complete.
+        """
+        entry = {"age": self.age, "requiredAge": self.required_age}
+        replies = self._worker_request(worker, {"batch": [entry] * count},
+                                       ROUND_TIMEOUT * count)
+        if not isinstance(replies, list):
+            return []
+
+        measured = []
+        for reply in replies:
+            if 'error' in reply:
+                break
+            measured.append((reply['proveNs'], reply['verifyNs'], reply['proofSize'], reply['ok']))
+        return measured
+
+    def _scratch_paths(self, system: str) -> Dict[str, str]:
+        """
+        Fixed per-system scratch files for the CLI path, reused every iteration.
 
-            # Create input file
-            input_data = {"age": str(self.age), "requiredAge": str(self.required_age)}
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                json.dump(input_data, f)
-                input_path = f.name
+        They live in /dev/shm when available so witness/proof I/O stays in RAM
+        instead of hitting the block device inside the timed region.
+        """
+        if self._scratch_dir is None:
+            base = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+            self._scratch_dir = tempfile.mkdtemp(prefix="zkp_bench_", dir=base)
+
+        slot = {
+            name: os.path.join(self._scratch_dir, f"{system}_{name}")
+            for name in ("input.json", "witness.wtns", "proof.json", "public.json")
+        }
+
+        # The input is the same for every iteration, write it once
+        with open(slot["input.json"], 'w') as f:
+            json.dump({"age": str(self.age), "requiredAge": str(self.required_age)}, f)
+
+        return slot
+
+    def _snark_iteration_cli(self, system: str, wasm_path: Path, zkey_path: Path,
+                             vkey_path: Path, witness_gen: Path, slot: Dict[str, str]) -> tuple:
+        """One prove+verify round via separate node/snarkjs processes."""
+        input_path = slot["input.json"]
+        witness_path = slot["witness.wtns"]
+        proof_path = slot["proof.json"]
+        public_path = slot["public.json"]
+
+        # Generate witness + prove (combined as "prove" time)
+        prove_start = time.perf_counter_ns()
+
+        success, _, _ = self._run_command([
+            "node", str(witness_gen), str(wasm_path),
+            input_path, witness_path
+        ], capture=False)
+
+        if success:
+            success, _, _ = self._run_command([
+                "npx", "snarkjs", system, "prove",
+                str(zkey_path), witness_path, proof_path, public_path
+            ], capture=False)
+
+        prove_ns = time.perf_counter_ns() - prove_start
+
+        # Files are overwritten in place, so a failed prove must not
+        # pick up the previous iteration's proof
+        if not success:
+            return prove_ns, 0, 0, False
+
+        # Get proof size (one stat; a missing proof counts as size 0)
+        try:
+            proof_size = os.stat(proof_path).st_size
+        except FileNotFoundError:
+            proof_size = 0
 
-            witness_path = tempfile.mktemp(suffix='.wtns')
-            proof_path = tempfile.mktemp(suffix='.json')
-            public_path = tempfile.mktemp(suffix='.json')
+        # Verify
+        verify_start = time.perf_counter_ns()
+        success, output, _ = self._run_command([
+            "npx", "snarkjs", system, "verify",
+            str(vkey_path), public_path, proof_path
+        ])
+        verify_ns = time.perf_counter_ns() - verify_start
+
+        is_valid = success and b"OK" in output
+
+        return prove_ns, verify_ns, proof_size, is_valid
+
+    def _snark_files(self, system: str) -> Optional[Dict[str, Path]]:
+        """Compiled circuit and key paths for a proving system, or None if any is missing."""
+        files = {
+            'zkey': self.circuits_path / f"age_check_{system}.zkey",
+            'vkey': self.circuits_path / f"verification_key_{system}.json",
+            'wasm': self.circuits_path / "age_check_js" / "age_check.wasm",
+            'witness_gen': self.circuits_path / "age_check_js" / "generate_witness.js",
+        }
+        if not all(files[k].exists() for k in ('zkey', 'vkey', 'wasm')):
+            return None
+        return files
+
+    def _print_missing_setup(self, label: str):
+        print(f"  {C.YELLOW}⚠{C.RESET} {label} setup files not found. Run: npm run compile")
+
+    def _benchmark_snark(self, system: str, label: str) -> BenchmarkResult:
+        """Shared Groth16/PLONK benchmark loop."""
+        result = BenchmarkResult.alloc(label, self.iterations, self.save_distributions)
+
+        files = self._snark_files(system)
+        if files is None:
+            self._print_missing_setup(label)
+            return result
+        zkey_path, vkey_path = files['zkey'], files['vkey']
+        wasm_path, witness_gen = files['wasm'], files['witness_gen']
 
-            is_valid = True
-            proof_size = 0
+        worker = None
+        slot = None
+        if self.persistent_worker:
+            worker = self._start_worker(system, wasm_path, zkey_path, vkey_path)
+            if worker is None:
+                print(f"  {C.YELLOW}⚠{C.RESET} node not found, falling back to snarkjs CLI")
 
-            try:
-                # Generate witness + prove (combined as "prove" time)
-                prove_start = time.perf_counter()
-
-                # Witness generation
-                self._run_command([
-                    "node", str(witness_gen), str(wasm_path),
-                    input_path, witness_path
-                ])
-
-                # Proof generation
-                self._run_command([
-                    "npx", "snarkjs", "groth16", "prove",
-                    str(zkey_path), witness_path, proof_path, public_path
-                ])
-
-                prove_time = (time.perf_counter() - prove_start) * 1000
-                result.prove_times.append(prove_time)
-
-                # Get proof size
-                if os.path.exists(proof_path):
-                    proof_size = os.path.getsize(proof_path)
-                    result.proof_sizes.append(proof_size)
-                else:
-                    result.proof_sizes.append(0)
-
-                # Verify
-                verify_start = time.perf_counter()
-                success, output, _ = self._run_command([
-                    "npx", "snarkjs", "groth16", "verify",
-                    str(vkey_path), public_path, proof_path
-                ])
-                verify_time = (time.perf_counter() - verify_start) * 1000
-                result.verify_times.append(verify_time)
-
-                if not success or "OK" not in output:
-                    is_valid = False
-                    result.all_valid = False
+        setup_ns = 0  # Setup already done (keys are generated by npm run compile)
 
-            finally:
-                # Cleanup
-                for p in [input_path, witness_path, proof_path, public_path]:
-                    if os.path.exists(p):
-                        os.unlink(p)
+        batch: List[tuple] = []
+        if worker is not None:
+            batch = self._snark_batch_worker(worker, self.iterations)
+            if len(batch) < self.iterations:
+                print(f"  {C.YELLOW}⚠{C.RESET} snarkjs worker failed, falling back to snarkjs CLI")
+
+        for i in range(self.iterations):
+            if i < len(batch):
+                measured = batch[i]
+            else:
+                if slot is None:
+                    slot = self._scratch_paths(system)
+                measured = self._snark_iteration_cli(system, wasm_path, zkey_path,
+                                                     vkey_path, witness_gen, slot)
+
+            prove_ns, verify_ns, proof_size, is_valid = measured
+            if is_valid:
+                result.record(setup_ns, prove_ns, verify_ns, proof_size)
+            else:
+                # A failed or timed-out run says nothing about prove/verify
+                # cost, so keep it out of the statistics
+                result.failures += 1
+                result.all_valid = False
 
             if self.verbose:
-                self._print_iteration(i + 1, self.iterations, "Groth16",
-                                      setup_time, prove_time, verify_time, proof_size, is_valid)
+                self._print_iteration(i + 1, self.iterations, label,
+                                      setup_ns, prove_ns, verify_ns, proof_size, is_valid)
             else:
-                self._print_progress(i + 1, self.iterations, "Groth16")
+                self._print_progress(i + 1, self.iterations, label)
 
-        result.iterations = self.iterations
-        if result.prove_times:
+        result.iterations = result.prove_stats.count
+        if result.prove_stats.count:
             print(f"  {C.GREEN}✓{C.RESET} Завершено: {C.BOLD_YELLOW}{result.prove_mean:.2f} мс{C.RESET} prove, {C.BOLD_YELLOW}{result.verify_mean:.2f} мс{C.RESET} verify")
+        if result.failures:
+            print(f"  {C.YELLOW}⚠{C.RESET} Невдалих ітерацій (не враховано): {result.failures}")
         return result
 
+    def benchmark_groth16(self) -> BenchmarkResult:
+        """Бенчмарк Groth16 zk-SNARK."""
+        print(f"\n{C.BOLD_WHITE}▶ Groth16 zk-SNARK{C.RESET}")
+        return self._benchmark_snark("groth16", "Groth16")
+
     def benchmark_plonk(self) -> BenchmarkResult:
         """Бенчмарк PLONK zk-SNARK."""
         print(f"\n{C.BOLD_WHITE}▶ PLONK zk-SNARK{C.RESET}")
-
-        result = BenchmarkResult(protocol_name="PLONK")
-
-        # Check if setup files exist
-        zkey_path = self.circuits_path / "age_check_plonk.zkey"
-        vkey_path = self.circuits_path / "verification_key_plonk.json"
-        wasm_path = self.circuits_path / "age_check_js" / "age_check.wasm"
-        witness_gen = self.circuits_path / "age_check_js" / "generate_witness.js"
-
-        if not all(p.exists() for p in [zkey_path, vkey_path, wasm_path]):
-            print(f"  {C.YELLOW}⚠{C.RESET} PLONK setup files not found. Run: npm run compile")
-            return result
-
-        for i in range(self.iterations):
-            setup_time = 0  # Setup already done
-            result.setup_times.append(setup_time)
-
-            # Create input file
-            input_data = {"age": str(self.age), "requiredAge": str(self.required_age)}
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                json.dump(input_data, f)
-                input_path = f.name
-
-            witness_path = tempfile.mktemp(suffix='.wtns')
-            proof_path = tempfile.mktemp(suffix='.json')
-            public_path = tempfile.mktemp(suffix='.json')
-
-            is_valid = True
-            proof_size = 0
-
-            try:
-                # Generate witness + prove
-                prove_start = time.perf_counter()
-
-                self._run_command([
-                    "node", str(witness_gen), str(wasm_path),
-                    input_path, witness_path
-                ])
-
-                self._run_command([
-                    "npx", "snarkjs", "plonk", "prove",
-                    str(zkey_path), witness_path, proof_path, public_path
-                ])
-
-                prove_time = (time.perf_counter() - prove_start) * 1000
-                result.prove_times.append(prove_time)
-
-                # Get proof size
-                if os.path.exists(proof_path):
-                    proof_size = os.path.getsize(proof_path)
-                    result.proof_sizes.append(proof_size)
-                else:
-                    result.proof_sizes.append(0)
-
-                # Verify
-                verify_start = time.perf_counter()
-                success, output, _ = self._run_command([
-                    "npx", "snarkjs", "plonk", "verify",
-                    str(vkey_path), public_path, proof_path
-                ])
-                verify_time = (time.perf_counter() - verify_start) * 1000
-                result.verify_times.append(verify_time)
-
-                if not success or "OK" not in output:
-                    is_valid = False
-                    result.all_valid = False
-
-            finally:
-                for p in [input_path, witness_path, proof_path, public_path]:
-                    if os.path.exists(p):
-                        os.unlink(p)
-
-            if self.verbose:
-                self._print_iteration(i + 1, self.iterations, "PLONK",
-                                      setup_time, prove_time, verify_time, proof_size, is_valid)
-            else:
-                self._print_progress(i + 1, self.iterations, "PLONK")
-
-        result.iterations = self.iterations
-        if result.prove_times:
-            print(f"  {C.GREEN}✓{C.RESET} Завершено: {C.BOLD_YELLOW}{result.prove_mean:.2f} мс{C.RESET} prove, {C.BOLD_YELLOW}{result.verify_mean:.2f} мс{C.RESET} verify")
-        return result
+        return self._benchmark_snark("plonk", "PLONK")
 
     def run_all(self) -> Dict[str, BenchmarkResult]:
         """Запуск усіх бенчмарків."""
@@ -373,12 +627,54 @@ class ProtocolBenchmark:
         print(f"Ітерацій: {self.iterations}")
         print(f"Тестовий сценарій: вік={self.age}, поріг={self.required_age}")
 
-        self.results['schnorr'] = self.benchmark_schnorr()
-        self.results['groth16'] = self.benchmark_groth16()
-        self.results['plonk'] = self.benchmark_plonk()
+        # Groth16/PLONK without compiled keys are skipped before any setup
+        names = ('schnorr', 'groth16', 'plonk')
+        skipped = {}
+        for system, label in SNARK_LABELS.items():
+            if self._snark_files(system) is None:
+                print(f"\n{C.BOLD_WHITE}▶ {label} zk-SNARK{C.RESET}")
+                self._print_missing_setup(label)
+                skipped[system] = BenchmarkResult(protocol_name=label)
+        todo = [name for name in names if name not in skipped]
+
+        if self.parallel:
+            results = self._run_all_parallel(todo)
+        else:
+            results = {}
+            try:
+                for name in todo:
+                    results[name] = getattr(self, f'benchmark_{name}')()
+            finally:
+                self.close()
 
+        for name in names:
+            self.results[name] = results[name] if name in results else skipped[name]
         return self.results
 
+    def _run_all_parallel(self, names: List[str]) -> Dict[str, BenchmarkResult]:
+        """Run the given benchmarks concurrently in a process pool."""
+        options = {
+            'iterations': self.iterations,
+            'age': self.age,
+            'required_age': self.required_age,
+            'verbose': self.verbose,
+            'persistent_worker': self.persistent_worker,
+            'save_distributions': self.save_distributions,
+        }
+
+        # Split the available cores so the benchmarks don't compete for them
+        cpu_sets: List[Optional[set]] = [None] * len(names)
+        if hasattr(os, 'sched_getaffinity'):
+            cpus = sorted(os.sched_getaffinity(0))
+            if len(cpus) >= len(names):
+                chunk = len(cpus) // len(names)
+                cpu_sets = [set(cpus[i * chunk:(i + 1) * chunk]) for i in range(len(names))]
+
+        with ProcessPoolExecutor(max_workers=len(names)) as ex:
+            futures = {name: ex.submit(_run_benchmark_process, name, options, cpus)
+                       for name, cpus in zip(names, cpu_sets)}
+            return {name: future.result() for name, future in futures.items()}
+
     def _make_bar(self, value: float, max_value: float, width: int = 30, char: str = "█") -> str:
         """Create an ASCII bar."""
         if max_value == 0:
@@ -394,26 +690,25 @@ class ProtocolBenchmark:
     def print_results(self):
         """Виведення результатів бенчмарку."""
         print("\n")
-        print(f"{C.BOLD_CYAN}{'═' * 80}{C.RESET}")
-        print(f"{C.BOLD_WHITE}{'РЕЗУЛЬТАТИ ПОРІВНЯННЯ ZK-ПРОТОКОЛІВ'.center(80)}{C.RESET}")
-        print(f"{C.BOLD_CYAN}{'═' * 80}{C.RESET}")
-        print(f"{C.BOLD_WHITE}{'Протокол':<12} {'Setup (мс)':<14} {'Prove (мс)':<14} {'Verify (мс)':<14} {'Proof (Б)':<12} {'Валід':<8}{C.RESET}")
-        print(f"{C.DIM}{'─' * 80}{C.RESET}")
+        print(RESULTS_BANNER)
+        print(RESULTS_HEADER)
+        print(RESULTS_SEP)
 
         for name, result in self.results.items():
             if result.iterations == 0:
-                print(f"{C.DIM}{result.protocol_name:<12} {'N/A':<14} {'N/A':<14} {'N/A':<14} {'N/A':<12} {'N/A':<8}{C.RESET}")
+                print(ROW_NA_TMPL.format(proto=result.protocol_name))
             else:
                 setup_str = f"{result.setup_mean:.2f} ± {result.setup_std:.2f}"
                 prove_str = f"{result.prove_mean:.2f} ± {result.prove_std:.2f}"
                 verify_str = f"{result.verify_mean:.2f} ± {result.verify_std:.2f}"
                 size_str = f"{result.proof_size_mean:.0f}"
-                valid_str = f"{C.BOLD_GREEN}OK{C.RESET}" if result.all_valid else f"{C.BOLD_RED}FAIL{C.RESET}"
+                valid_str = ROW_OK if result.all_valid else ROW_FAIL
 
-                print(f"{C.BOLD_CYAN}{result.protocol_name:<12}{C.RESET} {C.YELLOW}{setup_str:<14}{C.RESET} {C.YELLOW}{prove_str:<14}{C.RESET} {C.YELLOW}{verify_str:<14}{C.RESET} {C.BOLD_MAGENTA}{size_str:<12}{C.RESET} {valid_str}")
+                print(ROW_TMPL.format(proto=result.protocol_name, setup=setup_str, prove=prove_str,
+                                      verify=verify_str, size=size_str, valid=valid_str))
 
-        print(f"{C.DIM}{'─' * 80}{C.RESET}")
-        print(f"Ітерацій: {C.BOLD_WHITE}{self.iterations}{C.RESET}")
+        print(RESULTS_SEP)
+        print(RESULTS_FOOTER_TMPL.format(iterations=self.iterations))
         print()
 
     def print_ascii_charts(self):
@@ -521,34 +816,28 @@ class ProtocolBenchmark:
     def print_detailed_stats(self):
         """Виведення детальної статистики."""
         print("\n")
-        print(f"{C.BOLD_CYAN}{'=' * 70}{C.RESET}")
-        print(f"{C.BOLD_WHITE}ДЕТАЛЬНА СТАТИСТИКА{C.RESET}")
-        print(f"{C.BOLD_CYAN}{'=' * 70}{C.RESET}")
+        print(f"{BOLD_CYAN}{'=' * 70}{RESET}")
+        print(f"{BOLD_WHITE}ДЕТАЛЬНА СТАТИСТИКА{RESET}")
+        print(f"{BOLD_CYAN}{'=' * 70}{RESET}")
 
         for name, result in self.results.items():
             if result.iterations == 0:
                 continue
 
-            print(f"\n{C.BOLD_GREEN}{result.protocol_name}:{C.RESET}")
-            print(f"  {C.CYAN}Час setup:{C.RESET}")
-            print(f"    Mean: {C.BOLD_YELLOW}{result.setup_mean:.3f} мс{C.RESET}")
-            print(f"    Std:  {result.setup_std:.3f} мс")
-            print(f"    Min:  {min(result.setup_times):.3f} мс")
-            print(f"    Max:  {max(result.setup_times):.3f} мс")
-
-            print(f"  {C.CYAN}Час генерації:{C.RESET}")
-            print(f"    Mean: {C.BOLD_YELLOW}{result.prove_mean:.3f} мс{C.RESET}")
-            print(f"    Std:  {result.prove_std:.3f} мс")
-            print(f"    Min:  {min(result.prove_times):.3f} мс")
-            print(f"    Max:  {max(result.prove_times):.3f} мс")
-
-            print(f"  {C.CYAN}Час верифікації:{C.RESET}")
-            print(f"    Mean: {C.BOLD_YELLOW}{result.verify_mean:.3f} мс{C.RESET}")
-            print(f"    Std:  {result.verify_std:.3f} мс")
-            print(f"    Min:  {min(result.verify_times):.3f} мс")
-            print(f"    Max:  {max(result.verify_times):.3f} мс")
-
-            print(f"  {C.CYAN}Розмір доказу:{C.RESET} {C.BOLD_MAGENTA}{result.proof_size_mean:.0f} байт{C.RESET}")
+            print(f"\n{BOLD_GREEN}{result.protocol_name}:{RESET}")
+            # Min/max come from the running stats, no pass over the samples
+            for title, stats in (("Час setup:", result.setup_stats),
+                                 ("Час генерації:", result.prove_stats),
+                                 ("Час верифікації:", result.verify_stats)):
+                mean, std = stats.mean * NS_TO_MS, stats.std * NS_TO_MS
+                smin, smax = stats.min * NS_TO_MS, stats.max * NS_TO_MS
+                print(f"  {CYAN}{title}{RESET}")
+                print(f"    Mean: {BOLD_YELLOW}{mean:.3f} мс{RESET}")
+                print(f"    Std:  {std:.3f} мс")
+                print(f"    Min:  {smin:.3f} мс")
+                print(f"    Max:  {smax:.3f} мс")
+
+            print(f"  {CYAN}Розмір доказу:{RESET} {BOLD_MAGENTA}{result.proof_size_mean:.0f} байт{RESET}")
 
     def export_to_csv(self, filename: str):
         """Export results to CSV file."""
@@ -566,20 +855,15 @@ class ProtocolBenchmark:
                 'Proof Size (bytes)', 'All Valid'
             ])
 
-            # Data
-            for name, result in self.results.items():
-                writer.writerow([
-                    result.protocol_name,
-                    result.iterations,
-                    f"{result.setup_mean:.3f}",
-                    f"{result.setup_std:.3f}",
-                    f"{result.prove_mean:.3f}",
-                    f"{result.prove_std:.3f}",
-                    f"{result.verify_mean:.3f}",
-                    f"{result.verify_std:.3f}",
-                    f"{result.proof_size_mean:.0f}",
-                    result.all_valid
-                ])
+            # Data: full-precision floats; rounding is left to export_to_latex
+            writer.writerows([
+                [r.protocol_name, r.iterations,
+                 r.setup_mean, r.setup_std,
+                 r.prove_mean, r.prove_std,
+                 r.verify_mean, r.verify_std,
+                 r.proof_size_mean, r.all_valid]
+                for r in self.results.values()
+            ])
 
         print(f"\nResults exported to: {filename}")
 
@@ -612,20 +896,24 @@ class ProtocolBenchmark:
 
         print(f"LaTeX table exported to: {filename}")
 
-    def export_charts(self, output_dir: str = "charts"):
+    def export_charts(self, output_dir: str = "charts", formats: tuple = ('pdf', 'png'),
+                      dpi: int = 100):
         """
         Generate charts for thesis Section 3.4.
 
-        Creates:
-        - prove_verify_comparison.png - Bar chart of prove/verify times
-        - proof_size_comparison.png - Bar chart of proof sizes
-        - time_distribution.png - Box plot of time distribution
-        - combined_metrics.png - Combined comparison chart
+        Every chart is written once per entry in ``formats``. Vector PDF/SVG
+        is what LaTeX embeds and needs no rasterisation; PNG (at ``dpi``) is
+        kept as a preview. Figures use constrained layout and are written by
+        a small thread pool while the next chart is being built.
+
+        Creates (one file per format):
+        - prove_verify_comparison - Bar chart of prove/verify times
+        - proof_size_comparison - Bar chart of proof sizes
+        - time_distribution - Box plot of time distribution
+        - combined_metrics - Combined comparison chart
         """
         try:
-            import matplotlib.pyplot as plt
-            import matplotlib
-            matplotlib.use('Agg')  # Non-interactive backend
+            plt = _get_plt()
         except ImportError:
             print("ERROR: matplotlib not installed. Run: pip install matplotlib")
             return
@@ -639,10 +927,10 @@ class ProtocolBenchmark:
         verify_times = []
         verify_stds = []
         proof_sizes = []
-        colors = ['#2ecc71', '#3498db', '#9b59b6']  # green, blue, purple
+        colors = CHART_COLORS
 
         for name, result in self.results.items():
-            if result.iterations > 0 and result.prove_times:
+            if result.iterations > 0 and result.prove_stats.count:
                 protocols.append(result.protocol_name)
                 prove_times.append(result.prove_mean)
                 prove_stds.append(result.prove_std)
@@ -659,151 +947,158 @@ class ProtocolBenchmark:
         plt.rcParams['font.size'] = 12
         plt.rcParams['axes.titlesize'] = 14
         plt.rcParams['axes.labelsize'] = 12
-
-        # Chart 1: Prove vs Verify Time Comparison
-        fig, ax = plt.subplots(figsize=(10, 6))
-        x = range(len(protocols))
-        width = 0.35
-
-        bars1 = ax.bar([i - width/2 for i in x], prove_times, width,
-                       yerr=prove_stds, label='Prove Time', color='#3498db', capsize=5)
-        bars2 = ax.bar([i + width/2 for i in x], verify_times, width,
-                       yerr=verify_stds, label='Verify Time', color='#2ecc71', capsize=5)
-
-        ax.set_xlabel('Protocol')
-        ax.set_ylabel('Time (ms)')
-        ax.set_title('ZK Protocol Performance: Prove vs Verify Time')
-        ax.set_xticks(x)
-        ax.set_xticklabels(protocols)
-        ax.legend()
-        ax.grid(axis='y', alpha=0.3)
-
-        # Add value labels on bars
-        for bar in bars1:
-            height = bar.get_height()
-            ax.annotate(f'{height:.1f}',
-                       xy=(bar.get_x() + bar.get_width() / 2, height),
-                       xytext=(0, 3), textcoords="offset points",
-                       ha='center', va='bottom', fontsize=10)
-        for bar in bars2:
-            height = bar.get_height()
-            ax.annotate(f'{height:.1f}',
-                       xy=(bar.get_x() + bar.get_width() / 2, height),
-                       xytext=(0, 3), textcoords="offset points",
-                       ha='center', va='bottom', fontsize=10)
-
-        plt.tight_layout()
-        path1 = os.path.join(output_dir, 'prove_verify_comparison.png')
-        plt.savefig(path1, dpi=150, bbox_inches='tight')
-        plt.close()
-        print(f"  Chart saved: {path1}")
-
-        # Chart 2: Proof Size Comparison
-        fig, ax = plt.subplots(figsize=(8, 6))
-        bars = ax.bar(protocols, proof_sizes, color=colors[:len(protocols)], edgecolor='black')
-        ax.set_xlabel('Protocol')
-        ax.set_ylabel('Proof Size (bytes)')
-        ax.set_title('ZK Protocol Comparison: Proof Size')
-        ax.grid(axis='y', alpha=0.3)
-
-        for bar in bars:
-            height = bar.get_height()
-            ax.annotate(f'{height:.0f} B',
-                       xy=(bar.get_x() + bar.get_width() / 2, height),
-                       xytext=(0, 3), textcoords="offset points",
-                       ha='center', va='bottom', fontsize=11, fontweight='bold')
-
-        plt.tight_layout()
-        path2 = os.path.join(output_dir, 'proof_size_comparison.png')
-        plt.savefig(path2, dpi=150, bbox_inches='tight')
-        plt.close()
-        print(f"  Chart saved: {path2}")
-
-        # Chart 3: Time Distribution (Box Plot)
-        fig, axes = plt.subplots(1, 2, figsize=(12, 5))
-
-        # Prove time distribution
-        prove_data = []
-        labels = []
-        for name, result in self.results.items():
-            if result.iterations > 0 and result.prove_times:
-                prove_data.append(result.prove_times)
-                labels.append(result.protocol_name)
-
-        if prove_data:
-            bp1 = axes[0].boxplot(prove_data, labels=labels, patch_artist=True)
-            for patch, color in zip(bp1['boxes'], colors[:len(labels)]):
-                patch.set_facecolor(color)
-                patch.set_alpha(0.7)
-            axes[0].set_ylabel('Time (ms)')
-            axes[0].set_title('Prove Time Distribution')
-            axes[0].grid(axis='y', alpha=0.3)
-
-        # Verify time distribution
-        verify_data = []
-        for name, result in self.results.items():
-            if result.iterations > 0 and result.verify_times:
-                verify_data.append(result.verify_times)
-
-        if verify_data:
-            bp2 = axes[1].boxplot(verify_data, labels=labels, patch_artist=True)
-            for patch, color in zip(bp2['boxes'], colors[:len(labels)]):
-                patch.set_facecolor(color)
-                patch.set_alpha(0.7)
-            axes[1].set_ylabel('Time (ms)')
-            axes[1].set_title('Verify Time Distribution')
-            axes[1].grid(axis='y', alpha=0.3)
-
-        plt.tight_layout()
-        path3 = os.path.join(output_dir, 'time_distribution.png')
-        plt.savefig(path3, dpi=150, bbox_inches='tight')
-        plt.close()
-        print(f"  Chart saved: {path3}")
-
-        # Chart 4: Combined Metrics (Radar-like comparison using grouped bars)
-        fig, axes = plt.subplots(1, 3, figsize=(14, 5))
-
-        # Subplot 1: Prove Time
-        ax1 = axes[0]
-        bars = ax1.bar(protocols, prove_times, yerr=prove_stds,
-                       color=colors[:len(protocols)], capsize=5, edgecolor='black')
-        ax1.set_title('Prove Time (ms)')
-        ax1.set_ylabel('Time (ms)')
-        ax1.grid(axis='y', alpha=0.3)
-        for bar in bars:
-            height = bar.get_height()
-            ax1.annotate(f'{height:.1f}', xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3), textcoords="offset points", ha='center', fontsize=10)
-
-        # Subplot 2: Verify Time
-        ax2 = axes[1]
-        bars = ax2.bar(protocols, verify_times, yerr=verify_stds,
-                       color=colors[:len(protocols)], capsize=5, edgecolor='black')
-        ax2.set_title('Verify Time (ms)')
-        ax2.set_ylabel('Time (ms)')
-        ax2.grid(axis='y', alpha=0.3)
-        for bar in bars:
-            height = bar.get_height()
-            ax2.annotate(f'{height:.1f}', xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3), textcoords="offset points", ha='center', fontsize=10)
-
-        # Subplot 3: Proof Size
-        ax3 = axes[2]
-        bars = ax3.bar(protocols, proof_sizes, color=colors[:len(protocols)], edgecolor='black')
-        ax3.set_title('Proof Size (bytes)')
-        ax3.set_ylabel('Size (bytes)')
-        ax3.grid(axis='y', alpha=0.3)
-        for bar in bars:
-            height = bar.get_height()
-            ax3.annotate(f'{height:.0f}', xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3), textcoords="offset points", ha='center', fontsize=10)
-
-        plt.suptitle(f'ZK Protocol Comparison (n={self.iterations})', fontsize=14, fontweight='bold')
-        plt.tight_layout()
-        path4 = os.path.join(output_dir, 'combined_metrics.png')
-        plt.savefig(path4, dpi=150, bbox_inches='tight')
-        plt.close()
-        print(f"  Chart saved: {path4}")
+        plt.rcParams['figure.constrained_layout.use'] = True
+
+        pending = []
+        # The with-block waits for every submitted write, also when building
+        # a later chart raises
+        with ThreadPoolExecutor(max_workers=2) as io_pool:
+            def write_all(fig, paths: List[str]):
+                # One task per figure: a figure must not be drawn by two threads
+                for path in paths:
+                    fig.savefig(path, dpi=dpi)
+
+            def save(fig, name: str):
+                # Detach from pyplot so the next figure can be built while this
+                # one renders in the background
+                plt.close(fig)
+                paths = [os.path.join(output_dir, f"{name}.{fmt}") for fmt in formats]
+                pending.append((paths, io_pool.submit(write_all, fig, paths)))
+
+            # Chart 1: Prove vs Verify Time Comparison
+            fig, ax = plt.subplots(figsize=(10, 6))
+            x = range(len(protocols))
+            width = 0.35
+
+            bars1 = ax.bar([i - width/2 for i in x], prove_times, width,
+                           yerr=prove_stds, label='Prove Time', color='#3498db', capsize=5)
+            bars2 = ax.bar([i + width/2 for i in x], verify_times, width,
+                           yerr=verify_stds, label='Verify Time', color='#2ecc71', capsize=5)
+
+            ax.set_xlabel('Protocol')
+            ax.set_ylabel('Time (ms)')
+            ax.set_title('ZK Protocol Performance: Prove vs Verify Time')
+            ax.set_xticks(x)
+            ax.set_xticklabels(protocols)
+            ax.legend()
+            ax.grid(axis='y', alpha=0.3)
+
+            # Add value labels on bars
+            for bar in bars1:
+                height = bar.get_height()
+                ax.annotate(f'{height:.1f}',
+                           xy=(bar.get_x() + bar.get_width() / 2, height),
+                           xytext=(0, 3), textcoords="offset points",
+                           ha='center', va='bottom', fontsize=10)
+            for bar in bars2:
+                height = bar.get_height()
+                ax.annotate(f'{height:.1f}',
+                           xy=(bar.get_x() + bar.get_width() / 2, height),
+                           xytext=(0, 3), textcoords="offset points",
+                           ha='center', va='bottom', fontsize=10)
+
+            save(fig, 'prove_verify_comparison')
+
+            # Chart 2: Proof Size Comparison
+            fig, ax = plt.subplots(figsize=(8, 6))
+            bars = ax.bar(protocols, proof_sizes, color=colors[:len(protocols)], edgecolor='black')
+            ax.set_xlabel('Protocol')
+            ax.set_ylabel('Proof Size (bytes)')
+            ax.set_title('ZK Protocol Comparison: Proof Size')
+            ax.grid(axis='y', alpha=0.3)
+
+            for bar in bars:
+                height = bar.get_height()
+                ax.annotate(f'{height:.0f} B',
+                           xy=(bar.get_x() + bar.get_width() / 2, height),
+                           xytext=(0, 3), textcoords="offset points",
+                           ha='center', va='bottom', fontsize=11, fontweight='bold')
+
+            save(fig, 'proof_size_comparison')
+
+            # Chart 3: Time Distribution (Box Plot)
+            # Needs the raw samples, which are only kept with save_distributions
+            prove_data = []
+            verify_data = []
+            labels = []
+            for name, result in self.results.items():
+                if result.iterations > 0 and result.prove_times.size:
+                    prove_data.append(result.prove_times)
+                    verify_data.append(result.verify_times)
+                    labels.append(result.protocol_name)
+
+            if prove_data:
+                fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+
+                # Prove time distribution
+                bp1 = axes[0].boxplot(prove_data, patch_artist=True)
+                axes[0].set_xticklabels(labels)
+                for patch, color in zip(bp1['boxes'], colors[:len(labels)]):
+                    patch.set_facecolor(color)
+                    patch.set_alpha(0.7)
+                axes[0].set_ylabel('Time (ms)')
+                axes[0].set_title('Prove Time Distribution')
+                axes[0].grid(axis='y', alpha=0.3)
+
+                # Verify time distribution
+                bp2 = axes[1].boxplot(verify_data, patch_artist=True)
+                axes[1].set_xticklabels(labels)
+                for patch, color in zip(bp2['boxes'], colors[:len(labels)]):
+                    patch.set_facecolor(color)
+                    patch.set_alpha(0.7)
+                axes[1].set_ylabel('Time (ms)')
+                axes[1].set_title('Verify Time Distribution')
+                axes[1].grid(axis='y', alpha=0.3)
+
+                save(fig, 'time_distribution')
+            else:
+                print("  Skipping time_distribution (run with save_distributions=True)")
+
+            # Chart 4: Combined Metrics (Radar-like comparison using grouped bars)
+            fig, axes = plt.subplots(1, 3, figsize=(14, 5))
+
+            # Subplot 1: Prove Time
+            ax1 = axes[0]
+            bars = ax1.bar(protocols, prove_times, yerr=prove_stds,
+                           color=colors[:len(protocols)], capsize=5, edgecolor='black')
+            ax1.set_title('Prove Time (ms)')
+            ax1.set_ylabel('Time (ms)')
+            ax1.grid(axis='y', alpha=0.3)
+            for bar in bars:
+                height = bar.get_height()
+                ax1.annotate(f'{height:.1f}', xy=(bar.get_x() + bar.get_width() / 2, height),
+                            xytext=(0, 3), textcoords="offset points", ha='center', fontsize=10)
+
+            # Subplot 2: Verify Time
+            ax2 = axes[1]
+            bars = ax2.bar(protocols, verify_times, yerr=verify_stds,
+                           color=colors[:len(protocols)], capsize=5, edgecolor='black')
+            ax2.set_title('Verify Time (ms)')
+            ax2.set_ylabel('Time (ms)')
+            ax2.grid(axis='y', alpha=0.3)
+            for bar in bars:
+                height = bar.get_height()
+                ax2.annotate(f'{height:.1f}', xy=(bar.get_x() + bar.get_width() / 2, height),
+                            xytext=(0, 3), textcoords="offset points", ha='center', fontsize=10)
+
+            # Subplot 3: Proof Size
+            ax3 = axes[2]
+            bars = ax3.bar(protocols, proof_sizes, color=colors[:len(protocols)], edgecolor='black')
+            ax3.set_title('Proof Size (bytes)')
+            ax3.set_ylabel('Size (bytes)')
+            ax3.grid(axis='y', alpha=0.3)
+            for bar in bars:
+                height = bar.get_height()
+                ax3.annotate(f'{height:.0f}', xy=(bar.get_x() + bar.get_width() / 2, height),
+                            xytext=(0, 3), textcoords="offset points", ha='center', fontsize=10)
+
+            fig.suptitle(f'ZK Protocol Comparison (n={self.iterations})', fontsize=14, fontweight='bold')
+            save(fig, 'combined_metrics')
+
+        for paths, future in pending:
+            future.result()
+            for path in paths:
+                print(f"  Chart saved: {path}")
 
         print(f"\nAll charts exported to: {output_dir}/")
 
@@ -818,11 +1113,26 @@ class ProtocolBenchmark:
                 'prove_ms': {'mean': result.prove_mean, 'std': result.prove_std},
                 'verify_ms': {'mean': result.verify_mean, 'std': result.verify_std},
                 'proof_size_bytes': result.proof_size_mean,
-                'all_valid': result.all_valid
+                'all_valid': result.all_valid,
+                'failures': result.failures
             }
         return summary
 
 
+def _run_benchmark_process(name: str, options: dict, cpus: Optional[set]) -> BenchmarkResult:
+    """ProcessPoolExecutor entry point: run one benchmark in a fresh suite."""
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+
+    # The parent has already printed the library banner
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark = ProtocolBenchmark(**options)
+    try:
+        return getattr(benchmark, f'benchmark_{name}')()
+    finally:
+        benchmark.close()
+
+
 def run_quick_benchmark():
     """Run a quick benchmark with fewer iterations."""
     benchmark = ProtocolBenchmark(iterations=10)
@@ -46,11 +46,25 @@ class Colors:
     BG_BLUE = '\033[44m'
 
 
-def colorize(text: str, color: str) -> str:
-    """Apply color to text if colors are enabled."""
-    if not COLORS_ENABLED:
+# Module-level aliases, so hot print loops can use plain names instead of
+# an attribute lookup on Colors for every code
+RESET = Colors.RESET
+RED, GREEN, YELLOW, BLUE = Colors.RED, Colors.GREEN, Colors.YELLOW, Colors.BLUE
+MAGENTA, CYAN, WHITE = Colors.MAGENTA, Colors.CYAN, Colors.WHITE
+BOLD, DIM = Colors.BOLD, Colors.DIM
+BOLD_RED, BOLD_GREEN, BOLD_YELLOW = Colors.BOLD_RED, Colors.BOLD_GREEN, Colors.BOLD_YELLOW
+BOLD_MAGENTA, BOLD_CYAN, BOLD_WHITE = Colors.BOLD_MAGENTA, Colors.BOLD_CYAN, Colors.BOLD_WHITE
+
+
+# Chosen once at import so the enabled check isn't repeated on every call
+if COLORS_ENABLED:
+    def colorize(text: str, color: str) -> str:
+        """Apply color to text if colors are enabled."""
+        return f"{color}{text}{RESET}"
+else:
+    def colorize(text: str, color: str) -> str:
+        """Apply color to text if colors are enabled."""
         return text
-    return f"{color}{text}{Colors.RESET}"
 
 
 # Convenience functions
@@ -114,3 +128,28 @@ FAIL = f"{Colors.BOLD_RED}✗ FAIL{Colors.RESET}"
 OK = f"{Colors.BOLD_GREEN}OK{Colors.RESET}"
 VALID = f"{Colors.BOLD_GREEN}VALID{Colors.RESET}"
 INVALID = f"{Colors.BOLD_RED}INVALID{Colors.RESET}"
+
+
+# Without a TTY, swap in plain-text versions once at import instead of
+# colouring and checking COLORS_ENABLED on every call
+if not COLORS_ENABLED:
+    def _plain(text: str) -> str:
+        return text
+
+    success = error = warning = info = highlight = bold = dim = _plain
+
+    def header(text: str, width: int = 70) -> str:
+        """Create a plain header."""
+        line = "=" * width
+        return f"{line}\n{text.center(width)}\n{line}"
+
+    def box(title: str, content: list, width: int = 70) -> str:
+        """Create a plain box with title and content."""
+        line = "=" * width
+        return "\n".join([line, title.center(width), line, *content, line])
+
+    PASS = "✓ PASS"
+    FAIL = "✗ FAIL"
+    OK = "OK"
+    VALID = "VALID"
+    INVALID = "INVALID"
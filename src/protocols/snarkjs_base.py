@@ -0,0 +1,518 @@
+"""
+Shared snarkjs plumbing for the Groth16 and PLONK wrappers.
+
+Both proving systems run the same pipeline (circom compile, powers of tau,
+snarkjs setup, witness + prove, verify) and differ only in the snarkjs
+subcommand and the names of their key files, so everything lives here and
+the subclasses set _proving_system.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
+
+from .snarkjs_worker import SnarkJSWorker, init_pool_protocol, pool_prove
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+NS_TO_MS = 1e-6
+
+PTAU_URL = "https://hermez.s3-eu-west-1.amazonaws.com/powersOfTau28_hez_final_12.ptau"
+
+def _sha256_file(path: str) -> Optional[str]:
+    """Hex SHA-256 of a file, read in 1 MiB chunks; None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+# check_dependencies() result, shared by every Groth16/PLONK instance
+_deps_cache: Optional[Dict[str, bool]] = None
+
+
+class _BaseSnarkJSProtocol:
+    """
+    Common base of Groth16Protocol and PlonkProtocol.
+
+    Workflow:
+    1. setup() - Generate proving and verification keys
+    2. prove() - Generate proof for private inputs
+    3. verify() - Verify proof with public inputs
+    """
+
+    # snarkjs subcommand ("groth16" or "plonk"); also names the key files
+    _proving_system: str = None
+
+    def __init__(self, circuit_path: str = None, build_dir: str = None,
+                 persistent_worker: bool = True):
+        """
+        Initialize the protocol wrapper.
+
+        Args:
+            circuit_path: Path to .circom circuit file
+            build_dir: Directory for compiled artifacts
+            persistent_worker: Prove/verify through one long-lived snarkjs
+                process instead of spawning the CLI per call (falls back to
+                the CLI if node or snarkjs is unavailable)
+        """
+        base_path = Path(__file__).parent.parent.parent
+        self.circuit_path = circuit_path or str(base_path / "circuits" / "age_check.circom")
+        self.build_dir = build_dir or str(base_path / "circuits" / "compiled")
+
+        # Paths for generated files
+        self.wasm_path = os.path.join(self.build_dir, "age_check_js", "age_check.wasm")
+        self.r1cs_path = os.path.join(self.build_dir, "age_check.r1cs")
+        self.zkey_path = os.path.join(self.build_dir, f"age_check_{self._proving_system}.zkey")
+        self.vkey_path = os.path.join(self.build_dir, f"verification_key_{self._proving_system}.json")
+
+        # Node >= 22 keeps compiled bytecode for snarkjs and generate_witness.js
+        # here, so repeated CLI calls skip most of the JS compile; older Node
+        # ignores the variable
+        self._env = dict(os.environ)
+        self._env.setdefault("NODE_COMPILE_CACHE", os.path.join(self.build_dir, ".node_cache"))
+
+        self._scratch_dir = self._pick_scratch_dir()
+
+        self._setup_complete = False
+        self._metrics = {}
+        self._worker = SnarkJSWorker(
+            self._proving_system, self.wasm_path, self.zkey_path, self.vkey_path,
+            env=self._env
+        ) if persistent_worker else None
+        self._pool: Optional["ProcessPoolExecutor"] = None
+
+    @staticmethod
+    def _pick_scratch_dir() -> str:
+        """/dev/shm (RAM-backed on Linux) if writable, else the system temp dir."""
+        if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+            return "/dev/shm"
+        return tempfile.gettempdir()
+
+    def _run_command(self, cmd: list, description: str = "") -> Tuple[bool, str]:
+        """Execute shell command and return result."""
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                env=self._env,
+                timeout=300  # 5 minute timeout
+            )
+            if result.returncode != 0:
+                return False, result.stderr
+            return True, result.stdout
+        except subprocess.TimeoutExpired:
+            return False, f"Command timed out: {description}"
+        except FileNotFoundError as e:
+            return False, f"Command not found: {e}"
+
+    def check_dependencies(self) -> Dict[str, bool]:
+        """Check if required tools are installed (probed once per process)."""
+        global _deps_cache
+        if _deps_cache is not None:
+            return dict(_deps_cache)
+        # concurrent.futures (with multiprocessing and logging) is imported on
+        # first use, so importing the wrappers stays cheap
+        from concurrent.futures import ThreadPoolExecutor
+
+        # The three version probes are independent subprocesses; run them at once
+        tools = ("circom", "snarkjs", "node")
+        with ThreadPoolExecutor(max_workers=len(tools)) as executor:
+            futures = {
+                tool: executor.submit(self._run_command, [tool, "--version"], f"{tool} version")
+                for tool in tools
+            }
+            deps = {tool: future.result()[0] for tool, future in futures.items()}
+
+        _deps_cache = deps
+        return dict(deps)
+
+    @property
+    def _circuit_hash_path(self) -> str:
+        return os.path.join(self.build_dir, ".circuit_hash")
+
+    def _circuit_source_hash(self) -> Optional[str]:
+        """SHA-256 of the .circom source, or None if it cannot be read."""
+        return _sha256_file(self.circuit_path)
+
+    def _circuit_up_to_date(self) -> bool:
+        """
+        True if the compiled R1CS can be reused.
+
+        The R1CS must exist and the source hash recorded by an earlier
+        compile_circuit() must match the current .circom file. Artifacts
+        without a recorded hash are treated as stale.
+        """
+        if not os.path.exists(self.r1cs_path) or not os.path.exists(self.wasm_path):
+            return False
+        try:
+            with open(self._circuit_hash_path) as f:
+                recorded = f.read().strip()
+        except OSError:
+            return False
+        return recorded == self._circuit_source_hash()
+
+    def compile_circuit(self) -> Tuple[bool, Dict]:
+        """
+        Compile circom circuit to R1CS and WASM.
+
+        Returns:
+            Tuple of (success, metrics)
+        """
+        start_time = time.perf_counter_ns()
+
+        os.makedirs(self.build_dir, exist_ok=True)
+
+        # Compile circuit
+        cmd = [
+            "circom", self.circuit_path,
+            "--r1cs",
+            "--wasm",
+            "--sym",
+            "-o", self.build_dir
+        ]
+
+        success, output = self._run_command(cmd, "compile circuit")
+
+        source_hash = self._circuit_source_hash()
+        if success and source_hash is not None:
+            with open(self._circuit_hash_path, 'w') as f:
+                f.write(source_hash)
+
+        compile_time = (time.perf_counter_ns() - start_time) * NS_TO_MS
+
+        metrics = {
+            'compile_time_ms': compile_time,
+            'success': success,
+            'output': output if not success else "Compilation successful"
+        }
+
+        return success, metrics
+
+    def _download_ptau(self, url: str, dest: str) -> bool:
+        """
+        Download a powers of tau file to dest.
+
+        The file is fetched into dest + ".part" and renamed only once curl
+        finishes, so an interrupted download never leaves a truncated ptau
+        that a later setup() would pick up; re-running resumes the partial
+        file (-C -) instead of starting the ~50MB transfer over.
+        """
+        part_path = dest + ".part"
+        download_cmd = [
+            "curl", "-L", "--fail", "--retry", "3",
+            "-C", "-",
+            url,
+            "-o", part_path
+        ]
+        success, _ = self._run_command(download_cmd, "download ptau")
+        if not success:
+            return False
+        os.replace(part_path, dest)
+        return True
+
+    def setup(self, ptau_path: str = None) -> Tuple[bool, Dict]:
+        """
+        Compile the circuit if needed and generate the proving key (zkey)
+        and verification key (vkey) from a powers of tau file.
+
+        Args:
+            ptau_path: Path to powers of tau file (downloads if not provided)
+
+        Returns:
+            Tuple of (success, metrics)
+        """
+        start_time = time.perf_counter_ns()
+        metrics = {'steps': []}
+
+        # Step 1: Compile circuit if missing or its source changed
+        if not self._circuit_up_to_date():
+            success, compile_metrics = self.compile_circuit()
+            metrics['compile'] = compile_metrics
+            if not success:
+                return False, metrics
+
+        # Step 2: Download or use provided ptau
+        if ptau_path is None:
+            ptau_path = os.path.join(self.build_dir, "pot12_final.ptau")
+            if not os.path.exists(ptau_path):
+                # Download powers of tau (pot12 supports up to 2^12 constraints)
+                if not self._download_ptau(PTAU_URL, ptau_path):
+                    metrics['error'] = "Failed to download powers of tau"
+                    return False, metrics
+
+        # Step 3: Generate zkey (proving key)
+        step3_start = time.perf_counter_ns()
+        zkey_cmd = [
+            "snarkjs", self._proving_system, "setup",
+            self.r1cs_path,
+            ptau_path,
+            self.zkey_path
+        ]
+        success, output = self._run_command(zkey_cmd, f"generate {self._proving_system} zkey")
+        metrics['steps'].append({
+            'name': 'generate_zkey',
+            'time_ms': (time.perf_counter_ns() - step3_start) * NS_TO_MS,
+            'success': success
+        })
+        if not success:
+            metrics['error'] = output
+            return False, metrics
+
+        # Step 4: Export verification key, unless it was exported from this
+        # exact zkey before (the zkey setup above is deterministic)
+        step4_start = time.perf_counter_ns()
+        zkey_hash = _sha256_file(self.zkey_path)
+        zkey_hash_path = os.path.join(self.build_dir, f".vkey_{self._proving_system}_zkey_hash")
+        try:
+            with open(zkey_hash_path) as f:
+                vkey_cached = (zkey_hash is not None and f.read().strip() == zkey_hash
+                               and os.path.exists(self.vkey_path))
+        except OSError:
+            vkey_cached = False
+
+        if vkey_cached:
+            success = True
+        else:
+            vkey_cmd = [
+                "snarkjs", "zkey", "export", "verificationkey",
+                self.zkey_path,
+                self.vkey_path
+            ]
+            success, output = self._run_command(vkey_cmd, "export vkey")
+        metrics['steps'].append({
+            'name': 'export_vkey',
+            'time_ms': (time.perf_counter_ns() - step4_start) * NS_TO_MS,
+            'success': success,
+            'cached': vkey_cached
+        })
+        if not success:
+            metrics['error'] = output
+            return False, metrics
+        if not vkey_cached and zkey_hash is not None:
+            with open(zkey_hash_path, 'w') as f:
+                f.write(zkey_hash)
+
+        self._setup_complete = True
+        self._close_pool()
+        if self._worker is not None:
+            self._worker.close()  # pick up the new keys on the next request
+        metrics['total_time_ms'] = (time.perf_counter_ns() - start_time) * NS_TO_MS
+        metrics['success'] = True
+
+        return True, metrics
+
+    def prove(self, age: int, required_age: int) -> Tuple[Optional[Dict], Dict]:
+        """
+        Generate a proof that age >= required_age.
+
+        Args:
+            age: Private input (actual age, not revealed)
+            required_age: Public input (minimum required age)
+
+        Returns:
+            Tuple of (proof_dict, metrics)
+        """
+        start_time = time.perf_counter_ns()
+        metrics = {}
+
+        if not self._setup_complete and not os.path.exists(self.zkey_path):
+            return None, {'error': 'Setup not complete. Run setup() first.'}
+
+        # Create input file
+        input_data = {
+            "age": str(age),
+            "requiredAge": str(required_age)
+        }
+
+        if self._worker is not None:
+            reply = self._worker.prove(input_data)
+            if reply is not None and not reply['ok']:
+                return None, {'error': f"Proof generation failed: {reply['error']}"}
+            if reply is not None:
+                proof = reply['proof']
+                metrics['witness_time_ms'] = reply['witnessNs'] * NS_TO_MS
+                metrics['prove_time_ms'] = reply['proveNs'] * NS_TO_MS
+                metrics['proof_size_bytes'] = reply['proofSize']
+                metrics['total_time_ms'] = (time.perf_counter_ns() - start_time) * NS_TO_MS
+                metrics['success'] = True
+                return {
+                    'proof': proof,
+                    'public_signals': reply['publicSignals'],
+                    'protocol': self._proving_system
+                }, metrics
+
+        # Per-call scratch directory, on tmpfs when available: these files are
+        # read back once and dropped, and concurrent provers never share names
+        with tempfile.TemporaryDirectory(prefix="zkp_", dir=self._scratch_dir) as scratch_dir:
+            input_path = os.path.join(scratch_dir, "input.json")
+            with open(input_path, 'w') as f:
+                json.dump(input_data, f)
+
+            proof_path = os.path.join(scratch_dir, "proof.json")
+            public_path = os.path.join(scratch_dir, "public.json")
+
+            # Generate witness
+            witness_start = time.perf_counter_ns()
+            witness_path = os.path.join(scratch_dir, "witness.wtns")
+
+            witness_cmd = [
+                "node",
+                os.path.join(self.build_dir, "age_check_js", "generate_witness.js"),
+                self.wasm_path,
+                input_path,
+                witness_path
+            ]
+            success, output = self._run_command(witness_cmd, "generate witness")
+            metrics['witness_time_ms'] = (time.perf_counter_ns() - witness_start) * NS_TO_MS
+
+            if not success:
+                return None, {'error': f'Witness generation failed: {output}'}
+
+            # Generate proof
+            prove_start = time.perf_counter_ns()
+            prove_cmd = [
+                "snarkjs", self._proving_system, "prove",
+                self.zkey_path,
+                witness_path,
+                proof_path,
+                public_path
+            ]
+            success, output = self._run_command(prove_cmd, f"generate {self._proving_system} proof")
+            metrics['prove_time_ms'] = (time.perf_counter_ns() - prove_start) * NS_TO_MS
+
+            if not success:
+                return None, {'error': f'Proof generation failed: {output}'}
+
+            # Read proof
+            with open(proof_path, 'r') as f:
+                proof = json.load(f)
+            with open(public_path, 'r') as f:
+                public_signals = json.load(f)
+
+            metrics['proof_size_bytes'] = os.path.getsize(proof_path)
+            metrics['total_time_ms'] = (time.perf_counter_ns() - start_time) * NS_TO_MS
+            metrics['success'] = True
+
+            return {
+                'proof': proof,
+                'public_signals': public_signals,
+                'protocol': self._proving_system
+            }, metrics
+
+    def verify(self, proof_data: Dict) -> Tuple[bool, Dict]:
+        """
+        Verify a proof.
+
+        Args:
+            proof_data: Dict containing 'proof' and 'public_signals'
+
+        Returns:
+            Tuple of (is_valid, metrics)
+        """
+        start_time = time.perf_counter_ns()
+        metrics = {}
+
+        if not os.path.exists(self.vkey_path):
+            return False, {'error': 'Verification key not found. Run setup() first.'}
+
+        if self._worker is not None:
+            reply = self._worker.verify(proof_data['proof'], proof_data['public_signals'])
+            if reply is not None and not reply['ok']:
+                return False, {'error': reply['error']}
+            if reply is not None:
+                metrics['verify_time_ms'] = reply['verifyNs'] * NS_TO_MS
+                metrics['success'] = True
+                return reply['valid'], metrics
+
+        # Write proof and public signals to temp files
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', dir=self._scratch_dir,
+                                         delete=False) as f:
+            json.dump(proof_data['proof'], f)
+            proof_path = f.name
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', dir=self._scratch_dir,
+                                         delete=False) as f:
+            json.dump(proof_data['public_signals'], f)
+            public_path = f.name
+
+        try:
+            verify_cmd = [
+                "snarkjs", self._proving_system, "verify",
+                self.vkey_path,
+                public_path,
+                proof_path
+            ]
+            success, output = self._run_command(verify_cmd, f"verify {self._proving_system} proof")
+
+            metrics['verify_time_ms'] = (time.perf_counter_ns() - start_time) * NS_TO_MS
+            metrics['success'] = True
+
+            # snarkjs outputs "OK!" if verification succeeds
+            is_valid = success and "OK" in output
+
+            return is_valid, metrics
+
+        finally:
+            # Cleanup
+            if os.path.exists(proof_path):
+                os.unlink(proof_path)
+            if os.path.exists(public_path):
+                os.unlink(public_path)
+
+    def prove_batch(self, pairs: List[Tuple[int, int]]) -> List[Tuple[Optional[Dict], Dict]]:
+        """
+        Generate proofs for several independent (age, required_age) pairs.
+
+        Proving is CPU-bound inside snarkjs, so the pairs are spread over a
+        process pool (one process per core). The pool is created on the
+        first call and kept for later batches; each pool process holds its
+        own protocol instance, and with it its own persistent worker. The
+        pool uses the spawn start method: forked children would inherit this
+        instance's worker pipe and keep its node process from seeing EOF.
+
+        Args:
+            pairs: List of (age, required_age) tuples
+
+        Returns:
+            List of (proof_data, metrics) tuples, in the order of pairs
+        """
+        if len(pairs) <= 1:
+            return [self.prove(age, required_age) for age, required_age in pairs]
+
+        if self._pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_pool_protocol,
+                initargs=(type(self), self.circuit_path, self.build_dir)
+            )
+        ages, required_ages = zip(*pairs)
+        return list(self._pool.map(pool_prove, ages, required_ages))
+
+    def _close_pool(self):
+        """Shut down the prove_batch() pool; the next batch starts a fresh one."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def close(self):
+        """Stop the prove_batch() pool and the persistent snarkjs worker."""
+        self._close_pool()
+        if self._worker is not None:
+            self._worker.close()
+
@@ -0,0 +1,191 @@
+/*
+ * Persistent snarkjs prover/verifier for Groth16Protocol and PlonkProtocol.
+ *
+ * Usage: node snarkjs_worker.js <groth16|plonk> <circuit.wasm> <circuit.zkey> <verification_key.json>
+ *
+ * snarkjs (and with it the BN128 curve), the circuit WASM, the proving key
+ * and the verification key are loaded once at startup. After that the
+ * worker reads one JSON request per line from stdin and answers each with
+ * one JSON line on stdout:
+ *
+ *   {"op": "prove", "input": {"age": "25", "requiredAge": "18"}}
+ *   -> {"ok": true, "proof": {...}, "publicSignals": [...],
+ *       "witnessNs": 1234567, "proveNs": 12345678, "proofSize": 804}
+ *
+ *   {"op": "verify", "proof": {...}, "publicSignals": [...]}
+ *   -> {"ok": true, "valid": true, "verifyNs": 4567890}
+ *
+ *   {"op": "verifyBatch", "proofs": [{"proof": {...}, "publicSignals": [...]}, ...]}
+ *   -> {"ok": true, "valid": true, "verifyNs": 4567890}
+ *
+ * verifyBatch (Groth16 only) checks all proofs with one randomized
+ * product of pairings: each proof's equation
+ *
+ *   e(A_i, B_i) = e(alpha, beta) * e(vk_x_i, gamma) * e(C_i, delta)
+ *
+ * is raised to a fresh random 128-bit r_i and the results multiplied, so
+ * the alpha/beta, gamma and delta pairings are shared and the whole batch
+ * needs a single final exponentiation. "valid" is true only if every
+ * proof is valid; a false result does not say which one failed.
+ *
+ * Failures are answered with {"ok": false, "error": "..."}.
+ *
+ * The witness calculator is compiled from the WASM once, through
+ * circom_runtime (a snarkjs dependency). If it cannot be loaded, every
+ * prove falls back to snarkjs.wtns.calculate, which recompiles the WASM.
+ */
+
+const fs = require("fs");
+const readline = require("readline");
+const crypto = require("crypto");
+const snarkjs = require("snarkjs");
+
+async function main() {
+    const [system, wasmPath, zkeyPath, vkeyPath] = process.argv.slice(2);
+    const prover = snarkjs[system];
+    if (!prover) {
+        throw new Error(`Unknown proving system: ${system}`);
+    }
+
+    const wasm = { type: "mem", data: fs.readFileSync(wasmPath) };
+    const zkey = { type: "mem", data: fs.readFileSync(zkeyPath) };
+    const vkey = JSON.parse(fs.readFileSync(vkeyPath, "utf8"));
+
+    let witnessCalculator = null;
+    try {
+        const { WitnessCalculatorBuilder } = require("circom_runtime");
+        witnessCalculator = await WitnessCalculatorBuilder(wasm.data);
+    } catch (err) {
+        witnessCalculator = null;
+    }
+
+    async function prove(request) {
+        // Witness in memory: no .wtns file and no generate_witness.js process
+        let wtns = { type: "mem" };
+        const t0 = process.hrtime.bigint();
+        if (witnessCalculator) {
+            wtns = { type: "mem", data: await witnessCalculator.calculateWTNSBin(request.input, 0) };
+        } else {
+            await snarkjs.wtns.calculate(request.input, wasm, wtns);
+        }
+        const t1 = process.hrtime.bigint();
+        const { proof, publicSignals } = await prover.prove(zkey, wtns);
+        const t2 = process.hrtime.bigint();
+        return {
+            ok: true,
+            proof,
+            publicSignals,
+            witnessNs: Number(t1 - t0),
+            proveNs: Number(t2 - t1),
+            // Bytes of proof.json as the snarkjs CLI writes it
+            proofSize: Buffer.byteLength(JSON.stringify(proof, null, 1)),
+        };
+    }
+
+    let batchVerifier = null;
+
+    async function buildBatchVerifier() {
+        // ffjavascript ships with snarkjs; same curve and parsing as groth16.verify
+        const { buildBn128, utils, Scalar } = require("ffjavascript");
+        const curve = await buildBn128();
+        const vk = utils.unstringifyBigInts(vkey);
+        const G1 = curve.G1;
+        const G2 = curve.G2;
+        const IC = vk.IC.map((p) => G1.fromObject(p));
+        const alpha = G1.fromObject(vk.vk_alpha_1);
+        const beta = G2.fromObject(vk.vk_beta_2);
+        const gamma = G2.fromObject(vk.vk_gamma_2);
+        const delta = G2.fromObject(vk.vk_delta_2);
+
+        return async function verifyBatch(entries) {
+            const pairs = [];
+            let alphaAcc = G1.zero;
+            let vkxAcc = G1.zero;
+            let cAcc = G1.zero;
+            for (const entry of entries) {
+                const proof = utils.unstringifyBigInts(entry.proof);
+                const signals = utils.unstringifyBigInts(entry.publicSignals);
+                if (signals.length !== IC.length - 1) {
+                    return false;
+                }
+                let vkx = IC[0];
+                for (let i = 0; i < signals.length; i++) {
+                    if (Scalar.geq(signals[i], curve.r)) {
+                        return false;
+                    }
+                    vkx = G1.add(vkx, G1.timesScalar(IC[i + 1], signals[i]));
+                }
+                const r = Scalar.fromRprBE(crypto.randomBytes(16), 0, 16);
+                const A = G1.fromObject(proof.pi_a);
+                const B = G2.fromObject(proof.pi_b);
+                const C = G1.fromObject(proof.pi_c);
+                // Same point checks as snarkjs.groth16.verify
+                if (!G1.isValid(A) || !G2.isValid(B) || !G1.isValid(C)) {
+                    return false;
+                }
+                pairs.push(G1.neg(G1.timesScalar(A, r)), B);
+                alphaAcc = G1.add(alphaAcc, G1.timesScalar(alpha, r));
+                vkxAcc = G1.add(vkxAcc, G1.timesScalar(vkx, r));
+                cAcc = G1.add(cAcc, G1.timesScalar(C, r));
+            }
+            return await curve.pairingEq(
+                ...pairs,
+                alphaAcc, beta,
+                vkxAcc, gamma,
+                cAcc, delta
+            );
+        };
+    }
+
+    async function verifyBatchRequest(request) {
+        if (system !== "groth16") {
+            return { ok: false, error: "verifyBatch is only available for groth16" };
+        }
+        if (!batchVerifier) {
+            batchVerifier = await buildBatchVerifier();
+        }
+        const t0 = process.hrtime.bigint();
+        const valid = await batchVerifier(request.proofs);
+        const t1 = process.hrtime.bigint();
+        return { ok: true, valid: valid === true, verifyNs: Number(t1 - t0) };
+    }
+
+    async function verify(request) {
+        const t0 = process.hrtime.bigint();
+        const valid = await prover.verify(vkey, request.publicSignals, request.proof);
+        const t1 = process.hrtime.bigint();
+        return { ok: true, valid: valid === true, verifyNs: Number(t1 - t0) };
+    }
+
+    const rl = readline.createInterface({ input: process.stdin, terminal: false });
+
+    for await (const line of rl) {
+        if (!line.trim()) {
+            continue;
+        }
+        let reply;
+        try {
+            const request = JSON.parse(line);
+            if (request.op === "prove") {
+                reply = await prove(request);
+            } else if (request.op === "verify") {
+                reply = await verify(request);
+            } else if (request.op === "verifyBatch") {
+                reply = await verifyBatchRequest(request);
+            } else {
+                reply = { ok: false, error: `Unknown op: ${request.op}` };
+            }
+        } catch (err) {
+            reply = { ok: false, error: String(err && err.message ? err.message : err) };
+        }
+        process.stdout.write(JSON.stringify(reply) + "\n");
+    }
+
+    // snarkjs keeps curve worker threads alive; exit explicitly on EOF
+    process.exit(0);
+}
+
+main().catch((err) => {
+    process.stderr.write(String(err && err.stack ? err.stack : err) + "\n");
+    process.exit(1);
+});
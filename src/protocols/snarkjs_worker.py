@@ -0,0 +1,169 @@
+"""
+Persistent snarkjs worker shared by the Groth16 and PLONK wrappers.
+
+Spawning the snarkjs CLI costs a Node.js start, a snarkjs import and a
+BN128 curve build on every prove/verify, which is most of the wall time
+for a circuit as small as age_check. SnarkJSWorker keeps one Node process
+(snarkjs_worker.js) alive per proving system with the WASM, proving key
+and verification key already loaded, and talks to it over line-delimited
+JSON on stdin/stdout.
+"""
+
+import json
+import os
+import selectors
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, Optional
+try:
+    # Faster encoding of the proof/vkey-sized messages; stdlib json otherwise
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+
+WORKER_SCRIPT = Path(__file__).parent / "snarkjs_worker.js"
+
+# Seconds to wait for one reply, as for the snarkjs CLI calls it replaces
+REQUEST_TIMEOUT = 300
+
+
+def read_reply(process: subprocess.Popen, timeout: float) -> str:
+    """
+    One reply line from a worker's stdout; "" on EOF or after timeout seconds.
+
+    Reads the pipe's file descriptor directly, since a blocking readline()
+    would wait forever on a hung worker. Each request gets exactly one line
+    back, so nothing is left behind in the pipe for the next call.
+    """
+    fd = process.stdout.fileno()
+    deadline = time.monotonic() + timeout
+    chunks = []
+    with selectors.DefaultSelector() as selector:
+        selector.register(fd, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not selector.select(remaining):
+                return ""
+            chunk = os.read(fd, 1 << 16)
+            if not chunk:
+                return ""
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                return b"".join(chunks).decode()
+
+
+class SnarkJSWorker:
+    """
+    One long-lived ``node snarkjs_worker.js`` process.
+
+    Started lazily on the first request. Requests return the worker's
+    reply ({"ok": false, "error": ...} if snarkjs rejected it), or None
+    when the worker cannot be used at all (node missing, snarkjs not
+    installed, the process died or did not answer within timeout seconds),
+    so callers can fall back to the CLI.
+    """
+
+    def __init__(self, system: str, wasm_path: str, zkey_path: str,
+                 vkey_path: str, cwd: str = None, env: Dict[str, str] = None,
+                 timeout: float = REQUEST_TIMEOUT):
+        self.system = system
+        self.wasm_path = wasm_path
+        self.zkey_path = zkey_path
+        self.vkey_path = vkey_path
+        self.cwd = cwd or str(Path(__file__).parent.parent.parent)
+        self.env = env
+        self.timeout = timeout
+        self._process: Optional[subprocess.Popen] = None
+        # Set once the worker died without answering (e.g. snarkjs missing),
+        # so later calls go straight to the CLI instead of respawning node
+        self._unusable = False
+
+    def _start(self) -> Optional[subprocess.Popen]:
+        """Start the worker if it is not running yet."""
+        if self._unusable:
+            return None
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+
+        try:
+            self._process = subprocess.Popen(
+                ["node", str(WORKER_SCRIPT), self.system,
+                 self.wasm_path, self.zkey_path, self.vkey_path],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+                cwd=self.cwd,
+                env=self.env
+            )
+        except FileNotFoundError:
+            self._process = None
+            self._unusable = True
+        return self._process
+
+    def request(self, request: Dict) -> Optional[Dict]:
+        """Send one request line and read back the worker's JSON reply."""
+        process = self._start()
+        if process is None:
+            return None
+        try:
+            process.stdin.write(_dumps(request) + "\n")
+            process.stdin.flush()
+            line = read_reply(process, self.timeout)
+        except (BrokenPipeError, OSError):
+            line = ""
+        if not line:
+            # Dead or hung: stop it and let the caller use the CLI
+            process.kill()
+            self.close()
+            self._unusable = True
+            return None
+        return _loads(line)
+
+    def prove(self, input_data: Dict) -> Optional[Dict]:
+        """Witness + proof for one input; None if the worker is unusable."""
+        return self.request({"op": "prove", "input": input_data})
+
+    def verify(self, proof: Dict, public_signals: list) -> Optional[Dict]:
+        """Verify one proof; None if the worker is unusable."""
+        return self.request({"op": "verify", "proof": proof, "publicSignals": public_signals})
+
+    def verify_batch(self, entries: list) -> Optional[Dict]:
+        """Verify [{"proof", "publicSignals"}, ...] with one pairing check (Groth16)."""
+        return self.request({"op": "verifyBatch", "proofs": entries})
+
+    def close(self):
+        """Stop the worker process; the next request starts a fresh one."""
+        if self._process is not None and self._process.poll() is None:
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+        self._unusable = False
+
+
+# Per-process protocol instance for prove_batch() pools: each pool process
+# builds its own wrapper once, so its snarkjs worker stays warm across tasks
+_pool_protocol = None
+
+
+def init_pool_protocol(protocol_cls, circuit_path: str, build_dir: str):
+    """ProcessPoolExecutor initializer for prove_batch()."""
+    global _pool_protocol
+    _pool_protocol = protocol_cls(circuit_path, build_dir)
+
+
+def pool_prove(age: int, required_age: int):
+    """Run prove() on this pool process's protocol instance."""
+    return _pool_protocol.prove(age, required_age)
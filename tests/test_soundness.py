@@ -13,7 +13,11 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 import pytest
-from src.crypto_library_zkp import CryptographyLibraryZKP
+from py_ecc.secp256k1 import secp256k1
+from src.crypto_library_zkp import (
+    CryptographyLibraryZKP, GLV_LAMBDA, _bit_challenge, _from_jacobian, _from_jacobian_batch,
+    _glv_split
+)
 
 
 class TestSoundness:
@@ -136,6 +140,36 @@ class TestSoundness:
             "Equation s*G == R + c*C' should not hold."
         )
 
+    def test_unreduced_response_rejected(self):
+        """
+        Test: s + n must be rejected, not accepted as a second encoding.
+
+        The scalar mult works mod n, so without a range check the same
+        proof would verify with s and with s + n (malleability).
+        """
+        commitment, _ = self.zkp.create_age_commitment(25)
+        proof, _ = self.zkp.schnorr_prove(25, 18, commitment)
+
+        modified_proof = dict(proof, s=proof['s'] + self.zkp.curve_order)
+        is_valid, metrics = self.zkp.schnorr_verify(commitment, 18, modified_proof)
+
+        assert is_valid == False, "ERROR: unreduced response accepted!"
+        assert metrics['reason'] == 'Malformed proof'
+
+    def test_off_curve_nonce_rejected(self):
+        """
+        Test: a nonce point R that is not on secp256k1 is rejected.
+        """
+        commitment, _ = self.zkp.create_age_commitment(25)
+        proof, _ = self.zkp.schnorr_prove(25, 18, commitment)
+
+        R = proof['R']
+        modified_proof = dict(proof, R=(R[0], (R[1] + 1) % secp256k1.P))
+        is_valid, metrics = self.zkp.schnorr_verify(commitment, 18, modified_proof)
+
+        assert is_valid == False, "ERROR: off-curve R accepted!"
+        assert metrics['reason'] == 'Malformed proof'
+
     def test_wrong_required_age_rejected(self):
         """
         Test: Proof for different required_age must be rejected.
@@ -171,7 +205,7 @@ class TestSoundness:
 
         # All proofs should be different
         r_values = [p['R'] for p in proofs]
-        assert len(set(str(r) for r in r_values)) == 3, (
+        assert len(set(r_values)) == 3, (
             "ERROR: proofs are not unique! Possibly using mocks."
         )
 
@@ -180,6 +214,52 @@ class TestSoundness:
             is_valid, _ = self.zkp.schnorr_verify(commitment, 18, proof)
             assert is_valid == True, f"Proof #{i+1} is invalid!"
 
+        # ...and so should the batch as a whole
+        is_valid, _ = self.zkp.schnorr_verify_batch(commitment, 18, proofs)
+        assert is_valid == True, "Valid proofs rejected by batch verification!"
+
+    def test_batch_with_tampered_proof_rejected(self):
+        """
+        Test: One bad proof makes the whole batch fail, and is named.
+        """
+        commitment, _ = self.zkp.create_age_commitment(30)
+        proofs = [self.zkp.schnorr_prove(30, 18, commitment)[0] for _ in range(4)]
+
+        tampered = dict(proofs[2])
+        tampered['s'] = (tampered['s'] + 1) % self.zkp.curve_order
+        proofs[2] = tampered
+
+        is_valid, metrics = self.zkp.schnorr_verify_batch(commitment, 18, proofs)
+
+        assert is_valid == False, "ERROR: batch with tampered proof accepted!"
+        assert metrics['reason'] == 'Proof 2 failed'
+
+    def test_empty_batch_rejected(self):
+        """
+        Test: An empty batch proves nothing and must not verify.
+        """
+        commitment, _ = self.zkp.create_age_commitment(30)
+
+        is_valid, metrics = self.zkp.schnorr_verify_batch(commitment, 18, [])
+
+        assert is_valid == False, "ERROR: empty batch accepted!"
+        assert metrics['reason'] == 'Empty batch'
+
+    def test_statement_cache_cleared(self):
+        """
+        Test: Verification still succeeds after the statement cache is dropped.
+        """
+        commitment, _ = self.zkp.create_age_commitment(30)
+        proof, _ = self.zkp.schnorr_prove(30, 18, commitment)
+        self.zkp.schnorr_verify(commitment, 18, proof)
+
+        assert self.zkp._schnorr_statement.cache_info().currsize == 1
+        self.zkp.clear_statement_cache()
+        assert self.zkp._schnorr_statement.cache_info().currsize == 0
+
+        is_valid, _ = self.zkp.schnorr_verify(commitment, 18, proof)
+        assert is_valid == True, "Valid proof rejected after clearing the cache!"
+
 
 class TestZeroKnowledge:
     """Tests for the ZERO-KNOWLEDGE property."""
@@ -243,5 +323,340 @@ class TestEdgeCases:
         assert is_valid == True
 
 
+class TestMetricsDisabled:
+    """metrics_enabled=False skips timing but not verification."""
+
+    def setup_method(self):
+        """Initialize before each test."""
+        self.zkp = CryptographyLibraryZKP(metrics_enabled=False)
+
+    def test_proofs_valid_without_metrics(self):
+        """Test: both protocols still prove and verify, with empty metrics."""
+        commitment, _ = self.zkp.create_age_commitment(25)
+        proof, metrics = self.zkp.schnorr_prove(25, 18, commitment)
+        assert len(metrics) == 0
+        is_valid, metrics = self.zkp.schnorr_verify(commitment, 18, proof)
+        assert is_valid == True
+        assert len(metrics) == 0
+
+        commitment, blinding, metrics = self.zkp.create_pedersen_commitment(25)
+        assert len(metrics) == 0
+        proof, _ = self.zkp.pedersen_prove(25, 18, commitment, blinding)
+        assert self.zkp.pedersen_verify(commitment, 18, proof)[0] == True
+
+    def test_failure_reason_still_reported(self):
+        """Test: a rejected proof still says why."""
+        commitment, _ = self.zkp.create_age_commitment(25)
+        proof, _ = self.zkp.schnorr_prove(25, 18, commitment)
+        is_valid, metrics = self.zkp.schnorr_verify(commitment, 21, proof)
+        assert is_valid == False
+        assert 'reason' in metrics
+
+    def test_range_proof_without_metrics(self):
+        """Test: range and age-with-range proofs verify, with empty metrics."""
+        proof, metrics = self.zkp.prove_age_with_range(25, 18)
+        assert len(metrics) == 0
+        is_valid, metrics = self.zkp.verify_age_with_range(proof)
+        assert is_valid == True
+        assert len(metrics) == 0
+
+
+class TestFixedBaseTables:
+    """Precomputed G/H tables must not change any result."""
+
+    def setup_method(self):
+        """Initialize before each test (tables belong to the py_ecc path)."""
+        self.zkp = CryptographyLibraryZKP(backend='py_ecc')
+
+    def test_table_mult_matches_generic(self):
+        """Test: k*G and k*H are identical with and without tables."""
+        scalars = [1, 2, 18, 12345, self.zkp.curve_order - 1]
+        expected = [(self.zkp._scalar_mult(k), self.zkp._scalar_mult(k, self.zkp.H)) for k in scalars]
+
+        self.zkp.precompute_tables()
+
+        for k, (k_G, k_H) in zip(scalars, expected):
+            assert self.zkp._scalar_mult(k) == k_G
+            assert self.zkp._scalar_mult(k, self.zkp.H) == k_H
+
+    def test_proofs_valid_with_tables(self):
+        """Test: proofs made and checked with tables are still valid."""
+        self.zkp.precompute_tables()
+        commitment, _ = self.zkp.create_age_commitment(25)
+        proof, _ = self.zkp.schnorr_prove(25, 18, commitment)
+
+        is_valid, _ = self.zkp.schnorr_verify(commitment, 18, proof)
+        assert is_valid == True
+
+        is_valid, _ = self.zkp.schnorr_verify(commitment, 21, proof)
+        assert is_valid == False
+
+
+class TestMultiScalarMult:
+    """Shamir/Straus multi-scalar mult on the pure-Python path."""
+
+    def setup_method(self):
+        """Initialize before each test."""
+        self.zkp = CryptographyLibraryZKP(backend='py_ecc')
+
+    def test_matches_separate_mults(self):
+        """Test: a*P + b*Q + c*G equals the sum of separate mults."""
+        zkp = self.zkp
+        P = zkp._scalar_mult(777)
+        Q = zkp._scalar_mult(99, zkp.H)
+        a, b, c = 2**200 + 12345, zkp.curve_order - 3, 18
+
+        expected = zkp._point_add(zkp._point_add(zkp._scalar_mult(a, P), zkp._scalar_mult(b, Q)),
+                                  zkp._scalar_mult(c))
+        assert zkp._multi_scalar_mult([(a, P), (b, Q), (c, zkp.G)]) == expected
+        assert zkp._double_scalar_mult(a, P, b, Q) == zkp._point_add(zkp._scalar_mult(a, P),
+                                                                     zkp._scalar_mult(b, Q))
+
+    def test_cancelling_terms_give_infinity(self):
+        """Test: k*P + (-k)*P is the point at infinity."""
+        P = self.zkp._scalar_mult(777)
+        assert self.zkp._double_scalar_mult(5, P, -5, P) is None
+
+    def test_batch_normalization(self):
+        """Test: one-inversion Jacobian -> affine matches per-point, identities included."""
+        points = [secp256k1.jacobian_multiply(secp256k1.to_jacobian(secp256k1.G), k)
+                  for k in (1, 2, 3, 12345, 2**200)]
+        points.insert(2, (0, 0, 1))
+        assert _from_jacobian_batch(points) == [_from_jacobian(p) for p in points]
+        assert _from_jacobian_batch(points)[2] is None
+
+    def test_glv_split(self):
+        """Test: k = k1 + k2*LAMBDA mod n with both halves under 128 bits."""
+        n = self.zkp.curve_order
+        for k in (1, n - 1, 2**255 + 7, 0x1234567890ABCDEF << 128):
+            k1, k2 = _glv_split(k)
+            assert (k1 + k2 * GLV_LAMBDA) % n == k
+            assert abs(k1).bit_length() <= 128 and abs(k2).bit_length() <= 128
+
+    def test_glv_mult_matches_py_ecc(self):
+        """Test: GLV scalar mult agrees with py_ecc's plain multiply."""
+        P = secp256k1.multiply(secp256k1.G, 777)
+        for k in (1, 2, self.zkp.curve_order - 1, 2**200 + 12345):
+            assert self.zkp._scalar_mult(k, P) == secp256k1.multiply(P, k)
+
+    def test_pedersen_proof_valid(self):
+        """Test: the fused Pedersen verification accepts honest proofs only."""
+        commitment, r, _ = self.zkp.create_pedersen_commitment(25)
+        proof, _ = self.zkp.pedersen_prove(25, 18, commitment, r)
+        assert self.zkp.pedersen_verify(commitment, 18, proof)[0] == True
+
+        proof['s2'] = (proof['s2'] + 1) % self.zkp.curve_order
+        assert self.zkp.pedersen_verify(commitment, 18, proof)[0] == False
+
+
+class TestBitProofBatch:
+    """Randomized batch verification of the range proof's bit OR-proofs."""
+
+    def setup_method(self):
+        """Initialize before each test."""
+        self.zkp = CryptographyLibraryZKP(backend='py_ecc')
+        proof, _ = self.zkp.prove_range(200)
+        self.commitment = proof['commitment']
+        self.proof = proof
+
+    def test_many_point_multi_scalar_mult(self):
+        """Test: the windowed path (> 4 points) matches separate mults."""
+        zkp = self.zkp
+        terms = [(2**130 + i, C_i) for i, C_i in enumerate(self.proof['bit_commitments'])]
+        expected = None
+        for k, P in terms:
+            expected = zkp._point_add(expected, zkp._scalar_mult(k, P))
+        assert zkp._multi_scalar_mult(terms) == expected
+
+    def test_process_pool_range_proof_valid(self):
+        """Test: bit proofs built in worker processes verify."""
+        proof, _ = self.zkp.prove_range(200, max_workers=2)
+        assert self.zkp.verify_range(proof['commitment'], proof)[0] == True
+
+    def test_valid_batch_accepted(self):
+        """Test: honest bit proofs pass the batch check."""
+        assert self.zkp.verify_bit_is_binary_batch(
+            self.proof['bit_commitments'], self.proof['bit_proofs']) == True
+        assert self.zkp.verify_range(self.commitment, self.proof)[0] == True
+
+    def test_tampered_bit_proof_rejected(self):
+        """Test: one modified response fails the batch and is reported."""
+        bit_proofs = [dict(p) for p in self.proof['bit_proofs']]
+        bit_proofs[3]['s1'] = (bit_proofs[3]['s1'] + 1) % self.zkp.curve_order
+        assert self.zkp.verify_bit_is_binary_batch(
+            self.proof['bit_commitments'], bit_proofs) == False
+
+        valid, metrics = self.zkp.verify_range(
+            self.commitment, {**self.proof, 'bit_proofs': bit_proofs})
+        assert valid == False
+        assert metrics['reason'] == 'Bit 3 proof failed'
+
+    def test_wrong_commitment_rejected(self):
+        """Test: valid bit proofs for a different commitment are rejected."""
+        other = self.zkp._scalar_mult(201)
+        valid, metrics = self.zkp.verify_range(other, self.proof)
+        assert valid == False
+        assert metrics['reason'] == 'Commitment reconstruction failed'
+
+    def test_range_commitment_opens(self):
+        """Test: create_range_commitment returns a 5-tuple that opens to value*G + r*H."""
+        commitment, r, bits, bit_blindings, metrics = self.zkp.create_range_commitment(25, 8)
+
+        assert bits == [(25 >> i) & 1 for i in range(8)]
+        assert len(bit_blindings) == 8
+        assert commitment == self.zkp._point_add(
+            self.zkp._scalar_mult(25), self.zkp._scalar_mult(r, self.zkp.H)
+        )
+
+    def test_serialized_proof_roundtrip(self):
+        """Test: a compressed-point proof verifies and rejects off-curve bytes."""
+        data = self.zkp.serialize_range_proof(self.proof)
+        assert len(data) == 34 + 8 * 227
+        decoded = self.zkp.deserialize_range_proof(data)
+        assert 'blinding_factor' not in decoded
+        valid, _ = self.zkp.verify_range(decoded['commitment'], decoded)
+        assert valid == True
+
+        # x = 5 has no square root of x^3 + 7 on secp256k1
+        tampered = data[:1] + b'\x02' + (5).to_bytes(32, 'big') + data[34:]
+        with pytest.raises(ValueError):
+            self.zkp.deserialize_range_proof(tampered)
+
+        for truncated in (b'', data[:-1]):
+            with pytest.raises(ValueError):
+                self.zkp.deserialize_range_proof(truncated)
+
+
+class TestBulletproofs:
+    """Logarithmic-size range proofs (inner-product argument)."""
+
+    def setup_method(self):
+        """Initialize before each test."""
+        self.zkp = CryptographyLibraryZKP(backend='py_ecc')
+        self.proof, _ = self.zkp.prove_range_bulletproof(200, 8)
+        self.commitment = self.proof['commitment']
+
+    def test_valid_proof_accepted(self):
+        """Test: honest proofs verify, including both ends of the range."""
+        assert self.zkp.verify_range_bulletproof(self.commitment, self.proof)[0] == True
+        for value in (0, 255):
+            proof, _ = self.zkp.prove_range_bulletproof(value, 8)
+            assert self.zkp.verify_range_bulletproof(proof['commitment'], proof)[0] == True
+
+    def test_proof_is_logarithmic(self):
+        """Test: 8 bits need 3 inner-product rounds."""
+        assert len(self.proof['L']) == 3
+        assert len(self.proof['R']) == 3
+
+    def test_tampered_proof_rejected(self):
+        """Test: changing t_hat or an inner-product point fails."""
+        bad = {**self.proof, 't_hat': (self.proof['t_hat'] + 1) % self.zkp.curve_order}
+        assert self.zkp.verify_range_bulletproof(self.commitment, bad)[0] == False
+
+        bad = {**self.proof, 'L': [self.zkp._scalar_mult(3)] + self.proof['L'][1:]}
+        assert self.zkp.verify_range_bulletproof(self.commitment, bad)[0] == False
+
+    def test_wrong_commitment_rejected(self):
+        """Test: a proof does not verify against another commitment."""
+        other = self.zkp._scalar_mult(200)
+        valid, metrics = self.zkp.verify_range_bulletproof(other, self.proof)
+        assert valid == False
+        assert 'reason' in metrics
+
+    def test_out_of_range_rejected(self):
+        """Test: values outside [0, 2^n) and non power-of-two widths raise."""
+        with pytest.raises(ValueError):
+            self.zkp.prove_range_bulletproof(256, 8)
+        with pytest.raises(ValueError):
+            self.zkp.prove_range_bulletproof(5, 6)
+
+
+class TestBackends:
+    """The coincurve and py_ecc backends must be interchangeable."""
+
+    def setup_method(self):
+        """Initialize one instance per backend."""
+        pytest.importorskip("coincurve")
+        self.fast = CryptographyLibraryZKP(backend='coincurve')
+        self.slow = CryptographyLibraryZKP(backend='py_ecc')
+
+    def test_same_points(self):
+        """Test: both backends compute identical points."""
+        P = self.slow._scalar_mult(777)
+        for k in [1, 2, 18, 12345, self.fast.curve_order - 1]:
+            assert self.fast._scalar_mult(k) == self.slow._scalar_mult(k)
+            assert self.fast._scalar_mult(k, self.fast.H) == self.slow._scalar_mult(k, self.slow.H)
+            assert self.fast._scalar_mult(k, P) == self.slow._scalar_mult(k, P)
+        assert self.fast._point_add(P, P) == self.slow._point_add(P, P)
+        assert self.fast._point_sub(P, P) is None
+
+    def test_proofs_cross_verify(self):
+        """Test: a proof made with one backend verifies with the other."""
+        commitment, _ = self.fast.create_age_commitment(25)
+        proof, _ = self.fast.schnorr_prove(25, 18, commitment)
+        assert self.slow.schnorr_verify(commitment, 18, proof)[0] == True
+
+        # py_ecc batches through the multi-scalar mult, coincurve does not
+        proofs = [proof] + [self.fast.schnorr_prove(25, 18, commitment)[0] for _ in range(3)]
+        assert self.slow.schnorr_verify_batch(commitment, 18, proofs)[0] == True
+        proofs[1] = dict(proofs[1], s=(proofs[1]['s'] + 1) % self.slow.curve_order)
+        is_valid, metrics = self.slow.schnorr_verify_batch(commitment, 18, proofs)
+        assert is_valid == False and metrics['reason'] == 'Proof 1 failed'
+
+        range_proof, _ = self.slow.prove_age_with_range(25, 18)
+        assert self.fast.verify_age_with_range(range_proof)[0] == True
+
+        bulletproof, _ = self.fast.prove_range_bulletproof(25, 32)
+        assert self.slow.verify_range_bulletproof(bulletproof['commitment'], bulletproof)[0] == True
+
+    def test_off_curve_commitment_rejected(self):
+        """Test: both backends reject (not raise on) a commitment that is off the curve."""
+        commitment, _ = self.fast.create_age_commitment(25)
+        schnorr_proof, _ = self.fast.schnorr_prove(25, 18, commitment)
+        pedersen_commitment, r, _ = self.fast.create_pedersen_commitment(25)
+        pedersen_proof, _ = self.fast.pedersen_prove(25, 18, pedersen_commitment, r)
+        range_proof, _ = self.fast.prove_range(25, 8)
+        bulletproof, _ = self.fast.prove_range_bulletproof(25, 8)
+
+        def off_curve(P):
+            return (P[0], (P[1] + 1) % secp256k1.P)
+
+        for zkp in (self.fast, self.slow):
+            results = [
+                zkp.schnorr_verify(off_curve(commitment), 18, schnorr_proof),
+                zkp.schnorr_verify_batch(off_curve(commitment), 18, [schnorr_proof]),
+                zkp.pedersen_verify(off_curve(pedersen_commitment), 18, pedersen_proof),
+                zkp.verify_range(off_curve(range_proof['commitment']), range_proof),
+                zkp.verify_range_bulletproof(off_curve(bulletproof['commitment']), bulletproof),
+            ]
+            for is_valid, metrics in results:
+                assert is_valid == False
+                assert metrics['reason'] == 'Malformed proof'
+
+    def test_off_curve_bit_commitment_rejected(self):
+        """Test: the bit-proof batch rejects an off-curve point whose hash check passes."""
+        range_proof, _ = self.fast.prove_range(25, 8)
+        bit_commitments = list(range_proof['bit_commitments'])
+        bit_proofs = [dict(p) for p in range_proof['bit_proofs']]
+        bit_commitments[0] = (1, 2)
+        proof = bit_proofs[0]
+        proof['c0'] = (_bit_challenge((1, 2), proof['R0'], proof['R1'])
+                       - proof['c1']) % self.fast.curve_order
+
+        for zkp in (self.fast, self.slow):
+            assert zkp.verify_bit_is_binary_batch(bit_commitments, bit_proofs) == False
+
+    def test_threaded_range_proof_valid(self):
+        """Test: bit proofs built on a thread pool verify like serial ones."""
+        proof, _ = self.fast.prove_age_with_range(25, 18, max_workers=4)
+        assert self.fast.verify_age_with_range(proof)[0] == True
+        assert self.slow.verify_age_with_range(proof)[0] == True
+
+    def test_unknown_backend_rejected(self):
+        """Test: an unknown backend name is an error."""
+        with pytest.raises(ValueError):
+            CryptographyLibraryZKP(backend='openssl')
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])